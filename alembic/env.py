@@ -29,7 +29,9 @@ from app.models import (
     recipient,
     message_log,
     smart_link,
+    smart_link_unique_ip,
     click_event,
+    user_agent_signature,
     integration
 )
 
@@ -0,0 +1,37 @@
+"""Add smart_link_unique_ips
+
+Revision ID: 0f6d3b5e8a17
+Revises: e4a81d07c6b2
+Create Date: 2026-10-15 16:02:45.918230
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0f6d3b5e8a17'
+down_revision: Union[str, Sequence[str], None] = 'e4a81d07c6b2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'smart_link_unique_ips',
+        sa.Column('smart_link_id', sa.Integer(), nullable=False),
+        sa.Column('ip_hash', sa.BigInteger(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ['smart_link_id'], ['smart_links.id'],
+            name=op.f('fk_smart_link_unique_ips_smart_link_id_smart_links'), ondelete='CASCADE',
+        ),
+        sa.PrimaryKeyConstraint('smart_link_id', 'ip_hash', name=op.f('pk_smart_link_unique_ips')),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('smart_link_unique_ips')
@@ -0,0 +1,35 @@
+"""BIGINT ids for message_logs and click_events
+
+Revision ID: 2b8e5f0c7d91
+Revises: 9d2c6a4f1e85
+Create Date: 2026-10-15 17:20:31.642087
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2b8e5f0c7d91'
+down_revision: Union[str, Sequence[str], None] = '9d2c6a4f1e85'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+TABLES = ['message_logs', 'click_events']
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table in TABLES:
+        op.alter_column(table, 'id', type_=sa.BigInteger(), existing_type=sa.Integer(), existing_nullable=False)
+        op.execute(f'ALTER SEQUENCE {table}_id_seq AS BIGINT')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in TABLES:
+        op.execute(f'ALTER SEQUENCE {table}_id_seq AS INTEGER')
+        op.alter_column(table, 'id', type_=sa.Integer(), existing_type=sa.BigInteger(), existing_nullable=False)
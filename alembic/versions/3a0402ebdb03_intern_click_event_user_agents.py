@@ -0,0 +1,113 @@
+"""Intern click event user agents into user_agent_signatures
+
+Revision ID: 3a0402ebdb03
+Revises: dae3191d199f
+Create Date: 2026-10-15 10:12:41.118203
+
+"""
+import hashlib
+from datetime import datetime
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3a0402ebdb03'
+down_revision: Union[str, Sequence[str], None] = 'dae3191d199f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _ua_hash(user_agent: str) -> int:
+    # Frozen copy of app.utils.user_agent.ua_hash
+    digest = hashlib.blake2b(user_agent.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big", signed=True)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'user_agent_signatures',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('ua_hash', sa.BigInteger(), nullable=False),
+        sa.Column('user_agent', sa.String(length=500), nullable=True),
+        sa.Column('device_type', sa.String(length=50), nullable=True),
+        sa.Column('browser', sa.String(length=100), nullable=True),
+        sa.Column('os', sa.String(length=100), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('id', name=op.f('pk_user_agent_signatures')),
+        sa.UniqueConstraint('ua_hash', name=op.f('uq_user_agent_signatures_ua_hash')),
+    )
+    op.create_index(op.f('ix_user_agent_signatures_id'), 'user_agent_signatures', ['id'], unique=False)
+
+    op.add_column('click_events', sa.Column('ua_signature_id', sa.Integer(), nullable=True))
+    op.create_foreign_key(
+        op.f('fk_click_events_ua_signature_id_user_agent_signatures'),
+        'click_events', 'user_agent_signatures',
+        ['ua_signature_id'], ['id'],
+        ondelete='SET NULL',
+    )
+    op.create_index(op.f('ix_click_events_ua_signature_id'), 'click_events', ['ua_signature_id'], unique=False)
+
+    # Backfill: one signature per distinct UA, keeping the already-parsed fields
+    conn = op.get_bind()
+    rows = conn.execute(sa.text(
+        "SELECT DISTINCT ON (user_agent) user_agent, device_type, browser, os "
+        "FROM click_events WHERE user_agent IS NOT NULL"
+    )).all()
+    if rows:
+        now = datetime.utcnow()
+        conn.execute(
+            sa.text(
+                "INSERT INTO user_agent_signatures (ua_hash, user_agent, device_type, browser, os, created_at) "
+                "VALUES (:ua_hash, :user_agent, :device_type, :browser, :os, :created_at) "
+                "ON CONFLICT (ua_hash) DO NOTHING"
+            ),
+            [
+                {
+                    "ua_hash": _ua_hash(row.user_agent),
+                    "user_agent": row.user_agent,
+                    "device_type": row.device_type,
+                    "browser": row.browser,
+                    "os": row.os,
+                    "created_at": now,
+                }
+                for row in rows
+            ],
+        )
+        conn.execute(sa.text(
+            "UPDATE click_events AS c SET ua_signature_id = s.id "
+            "FROM user_agent_signatures AS s WHERE c.user_agent = s.user_agent"
+        ))
+
+    op.drop_index('ix_click_events_device', table_name='click_events')
+    op.drop_column('click_events', 'os')
+    op.drop_column('click_events', 'browser')
+    op.drop_column('click_events', 'device_type')
+    op.drop_column('click_events', 'user_agent')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.add_column('click_events', sa.Column('user_agent', sa.String(length=500), nullable=True))
+    op.add_column('click_events', sa.Column('device_type', sa.String(length=50), nullable=True))
+    op.add_column('click_events', sa.Column('browser', sa.String(length=100), nullable=True))
+    op.add_column('click_events', sa.Column('os', sa.String(length=100), nullable=True))
+    op.create_index('ix_click_events_device', 'click_events', ['device_type'], unique=False)
+
+    op.execute(
+        "UPDATE click_events AS c "
+        "SET user_agent = s.user_agent, device_type = s.device_type, browser = s.browser, os = s.os "
+        "FROM user_agent_signatures AS s WHERE c.ua_signature_id = s.id"
+    )
+
+    op.drop_index(op.f('ix_click_events_ua_signature_id'), table_name='click_events')
+    op.drop_constraint(
+        op.f('fk_click_events_ua_signature_id_user_agent_signatures'), 'click_events', type_='foreignkey'
+    )
+    op.drop_column('click_events', 'ua_signature_id')
+
+    op.drop_index(op.f('ix_user_agent_signatures_id'), table_name='user_agent_signatures')
+    op.drop_table('user_agent_signatures')
@@ -0,0 +1,28 @@
+"""Add (campaign_id, id) index on recipients
+
+Revision ID: 4e7b2d9a6c13
+Revises: 7a1d4c8e3f26
+Create Date: 2026-10-15 19:12:40.527316
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4e7b2d9a6c13'
+down_revision: Union[str, Sequence[str], None] = '7a1d4c8e3f26'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_recipients_campaign_id_id', 'recipients', ['campaign_id', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_recipients_campaign_id_id', table_name='recipients')
@@ -0,0 +1,52 @@
+"""Use JSONB for recipients.custom_data and integrations.config
+
+Revision ID: 5c9f2e71a0d3
+Revises: b71e04c9d2a8
+Create Date: 2026-10-15 15:04:38.771902
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5c9f2e71a0d3'
+down_revision: Union[str, Sequence[str], None] = 'b71e04c9d2a8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.alter_column(
+        'recipients', 'custom_data',
+        type_=postgresql.JSONB(), existing_type=sa.JSON(), existing_nullable=True,
+        postgresql_using='custom_data::jsonb',
+    )
+    op.alter_column(
+        'integrations', 'config',
+        type_=postgresql.JSONB(), existing_type=sa.JSON(), existing_nullable=True,
+        postgresql_using='config::jsonb',
+    )
+    op.create_index(
+        'ix_recipients_custom_data', 'recipients', ['custom_data'], unique=False,
+        postgresql_using='gin', postgresql_ops={'custom_data': 'jsonb_path_ops'},
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_recipients_custom_data', table_name='recipients')
+    op.alter_column(
+        'integrations', 'config',
+        type_=sa.JSON(), existing_type=postgresql.JSONB(), existing_nullable=True,
+        postgresql_using='config::json',
+    )
+    op.alter_column(
+        'recipients', 'custom_data',
+        type_=sa.JSON(), existing_type=postgresql.JSONB(), existing_nullable=True,
+        postgresql_using='custom_data::json',
+    )
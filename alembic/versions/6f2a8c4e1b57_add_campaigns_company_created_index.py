@@ -0,0 +1,34 @@
+"""Add (company_id, created_at DESC) index on campaigns
+
+Revision ID: 6f2a8c4e1b57
+Revises: 4e7b2d9a6c13
+Create Date: 2026-10-15 21:03:55.184620
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6f2a8c4e1b57'
+down_revision: Union[str, Sequence[str], None] = '4e7b2d9a6c13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'ix_campaigns_company_id_created_at', 'campaigns',
+        ['company_id', sa.text('created_at DESC')], unique=False
+    )
+    # company_id lookups use the leading column of the new index
+    op.drop_index('ix_campaigns_company_id', table_name='campaigns')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index('ix_campaigns_company_id', 'campaigns', ['company_id'], unique=False)
+    op.drop_index('ix_campaigns_company_id_created_at', table_name='campaigns')
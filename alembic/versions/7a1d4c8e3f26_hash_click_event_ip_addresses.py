@@ -0,0 +1,63 @@
+"""Replace click_events.ip_address with ip_hash
+
+Revision ID: 7a1d4c8e3f26
+Revises: c3f7a9e2b604
+Create Date: 2026-10-15 18:05:12.774390
+
+"""
+import hashlib
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.config import settings
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7a1d4c8e3f26'
+down_revision: Union[str, Sequence[str], None] = 'c3f7a9e2b604'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _ip_hash(ip_address: str) -> int:
+    # Frozen copy of app.utils.ip.ip_hash (keyed with the app's secret_key,
+    # so backfilled hashes match the ones written at runtime)
+    key = hashlib.blake2b(settings.secret_key_bytes, digest_size=32, person=b"ip-hash").digest()
+    digest = hashlib.blake2b(ip_address.encode("ascii"), digest_size=8, key=key).digest()
+    return int.from_bytes(digest, "big", signed=True)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('click_events', sa.Column('ip_hash', sa.BigInteger(), nullable=True))
+    
+    # Backfill: hash each distinct IP once, then one UPDATE ... FROM
+    conn = op.get_bind()
+    ips = conn.execute(sa.text(
+        "SELECT DISTINCT ip_address FROM click_events WHERE ip_address IS NOT NULL"
+    )).scalars().all()
+    if ips:
+        op.execute("CREATE TEMP TABLE click_ip_hashes (ip_address varchar(45), ip_hash bigint) ON COMMIT DROP")
+        conn.execute(
+            sa.text("INSERT INTO click_ip_hashes (ip_address, ip_hash) VALUES (:ip_address, :ip_hash)"),
+            [{"ip_address": ip, "ip_hash": _ip_hash(ip)} for ip in ips],
+        )
+        op.execute(
+            "UPDATE click_events AS c SET ip_hash = h.ip_hash "
+            "FROM click_ip_hashes AS h WHERE c.ip_address = h.ip_address"
+        )
+    
+    op.drop_index('ix_click_events_ip_address', table_name='click_events')
+    op.drop_column('click_events', 'ip_address')
+    op.create_index(op.f('ix_click_events_ip_hash'), 'click_events', ['ip_hash'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Hashes can't be reversed; the raw addresses are gone
+    op.drop_index(op.f('ix_click_events_ip_hash'), table_name='click_events')
+    op.drop_column('click_events', 'ip_hash')
+    op.add_column('click_events', sa.Column('ip_address', sa.String(length=45), nullable=True))
+    op.create_index('ix_click_events_ip_address', 'click_events', ['ip_address'], unique=False)
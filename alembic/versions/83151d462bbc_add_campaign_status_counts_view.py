@@ -0,0 +1,37 @@
+"""Add mv_campaign_status_counts materialized view
+
+Revision ID: 83151d462bbc
+Revises: 3a0402ebdb03
+Create Date: 2026-10-15 11:02:17.540912
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '83151d462bbc'
+down_revision: Union[str, Sequence[str], None] = '3a0402ebdb03'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute(
+        "CREATE MATERIALIZED VIEW IF NOT EXISTS mv_campaign_status_counts AS "
+        "SELECT campaign_id, status, count(*) AS n, max(updated_at) AS last_seen "
+        "FROM message_logs GROUP BY campaign_id, status"
+    )
+    # Required for REFRESH MATERIALIZED VIEW CONCURRENTLY
+    op.execute(
+        "CREATE UNIQUE INDEX IF NOT EXISTS uq_mv_campaign_status_counts "
+        "ON mv_campaign_status_counts (campaign_id, status)"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP MATERIALIZED VIEW IF EXISTS mv_campaign_status_counts")
@@ -0,0 +1,32 @@
+"""Drop single-column recipient indexes covered by composite ones
+
+Revision ID: 8c5e1a7d3f92
+Revises: 6f2a8c4e1b57
+Create Date: 2026-10-15 22:41:07.913254
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8c5e1a7d3f92'
+down_revision: Union[str, Sequence[str], None] = '6f2a8c4e1b57'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # campaign_id leads uq_recipient_campaign_phone and ix_recipients_campaign_id_id;
+    # phone_number is only ever looked up together with campaign_id
+    op.drop_index('ix_recipients_campaign_id', table_name='recipients')
+    op.drop_index('ix_recipients_phone_number', table_name='recipients')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index('ix_recipients_phone_number', 'recipients', ['phone_number'], unique=False)
+    op.create_index('ix_recipients_campaign_id', 'recipients', ['campaign_id'], unique=False)
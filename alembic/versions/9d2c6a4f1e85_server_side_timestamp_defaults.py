@@ -0,0 +1,52 @@
+"""Server-side defaults for created_at/updated_at/clicked_at
+
+Revision ID: 9d2c6a4f1e85
+Revises: 0f6d3b5e8a17
+Create Date: 2026-10-15 16:48:09.335174
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9d2c6a4f1e85'
+down_revision: Union[str, Sequence[str], None] = '0f6d3b5e8a17'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+TIMESTAMP_COLUMNS = [
+    ('companies', 'created_at'),
+    ('companies', 'updated_at'),
+    ('users', 'created_at'),
+    ('users', 'updated_at'),
+    ('campaigns', 'created_at'),
+    ('campaigns', 'updated_at'),
+    ('recipients', 'created_at'),
+    ('message_logs', 'created_at'),
+    ('message_logs', 'updated_at'),
+    ('smart_links', 'created_at'),
+    ('smart_links', 'updated_at'),
+    ('click_events', 'clicked_at'),
+    ('user_agent_signatures', 'created_at'),
+    ('integrations', 'created_at'),
+    ('integrations', 'updated_at'),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table, column in TIMESTAMP_COLUMNS:
+        op.alter_column(
+            table, column,
+            server_default=sa.text("timezone('utc', now())"), existing_type=sa.DateTime(),
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table, column in TIMESTAMP_COLUMNS:
+        op.alter_column(table, column, server_default=None, existing_type=sa.DateTime())
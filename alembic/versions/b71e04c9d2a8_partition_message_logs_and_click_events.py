@@ -0,0 +1,129 @@
+"""Partition message_logs and click_events by month
+
+Revision ID: b71e04c9d2a8
+Revises: 83151d462bbc
+Create Date: 2026-10-15 14:26:53.208417
+
+"""
+from datetime import date
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b71e04c9d2a8'
+down_revision: Union[str, Sequence[str], None] = '83151d462bbc'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Frozen copy of app.models.message_log.CAMPAIGN_STATUS_COUNTS_DDL
+STATUS_COUNTS_VIEW_DDL = (
+    "CREATE MATERIALIZED VIEW IF NOT EXISTS mv_campaign_status_counts AS "
+    "SELECT campaign_id, status, count(*) AS n, max(updated_at) AS last_seen "
+    "FROM message_logs GROUP BY campaign_id, status",
+    "CREATE UNIQUE INDEX IF NOT EXISTS uq_mv_campaign_status_counts "
+    "ON mv_campaign_status_counts (campaign_id, status)",
+)
+
+MESSAGE_LOGS_FOREIGN_KEYS = [
+    ('fk_message_logs_campaign_id_campaigns', 'campaigns', 'campaign_id', 'CASCADE'),
+    ('fk_message_logs_recipient_id_recipients', 'recipients', 'recipient_id', 'CASCADE'),
+]
+MESSAGE_LOGS_INDEXES = [
+    ('ix_message_logs_id', ['id']),
+    ('ix_message_logs_campaign_id', ['campaign_id']),
+    ('ix_message_logs_recipient_id', ['recipient_id']),
+    ('ix_message_logs_phone_number', ['phone_number']),
+    ('ix_message_logs_status', ['status']),
+    ('ix_message_logs_whatsapp_message_id', ['whatsapp_message_id']),
+    ('ix_message_logs_campaign_status', ['campaign_id', 'status']),
+]
+
+CLICK_EVENTS_FOREIGN_KEYS = [
+    ('fk_click_events_smart_link_id_smart_links', 'smart_links', 'smart_link_id', 'CASCADE'),
+    ('fk_click_events_ua_signature_id_user_agent_signatures', 'user_agent_signatures', 'ua_signature_id', 'SET NULL'),
+]
+CLICK_EVENTS_INDEXES = [
+    ('ix_click_events_id', ['id']),
+    ('ix_click_events_smart_link_id', ['smart_link_id']),
+    ('ix_click_events_ip_address', ['ip_address']),
+    ('ix_click_events_ua_signature_id', ['ua_signature_id']),
+    ('ix_click_events_link_clicked', ['smart_link_id', 'clicked_at']),
+    ('ix_click_events_country', ['country']),
+]
+
+
+def _month_starts(first: date, months_ahead: int):
+    """First day of every month from `first` through today + months_ahead"""
+    today = date.today()
+    last = (today.year * 12 + today.month - 1) + months_ahead
+    for n in range(first.year * 12 + first.month - 1, last + 2):
+        yield date(n // 12, n % 12 + 1, 1)
+
+
+def _rebuild(table: str, key: str, partitioned: bool, foreign_keys, indexes) -> None:
+    """
+    Recreate `table` (partitioned by month on `key`, or plain) and copy its rows.
+    
+    Indexes and constraints are added after the copy and after the old table
+    is dropped, so their names are free and the copy doesn't maintain them.
+    """
+    conn = op.get_bind()
+    old = f'{table}_old'
+    
+    op.execute(f'ALTER TABLE {table} RENAME TO {old}')
+    if partitioned:
+        op.execute(f'CREATE TABLE {table} (LIKE {old} INCLUDING DEFAULTS) PARTITION BY RANGE ({key})')
+        op.execute(f'CREATE TABLE {table}_default PARTITION OF {table} DEFAULT')
+        
+        # Monthly partitions from the oldest existing row through a year ahead
+        oldest = conn.execute(sa.text(f'SELECT min({key}) FROM {old}')).scalar() or date.today()
+        starts = list(_month_starts(date(oldest.year, oldest.month, 1), months_ahead=12))
+        for start, end in zip(starts, starts[1:]):
+            op.execute(
+                f"CREATE TABLE {table}_y{start.year}m{start.month:02d} PARTITION OF {table} "
+                f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+            )
+    else:
+        op.execute(f'CREATE TABLE {table} (LIKE {old} INCLUDING DEFAULTS)')
+    
+    op.execute(f'INSERT INTO {table} SELECT * FROM {old}')
+    # The SERIAL sequence is owned by the old column; keep it alive
+    op.execute(f'ALTER SEQUENCE {table}_id_seq OWNED BY {table}.id')
+    op.execute(f'DROP TABLE {old} CASCADE')
+    
+    op.create_primary_key(f'pk_{table}', table, ['id', key] if partitioned else ['id'])
+    for name, referred_table, column, ondelete in foreign_keys:
+        op.create_foreign_key(name, table, referred_table, [column], ['id'], ondelete=ondelete)
+    for name, columns in indexes:
+        op.create_index(name, table, columns, unique=False)
+    if partitioned:
+        op.create_index(f'ix_{table}_{key}', table, [key], unique=False, postgresql_using='brin')
+    else:
+        op.create_index(f'ix_{table}_{key}', table, [key], unique=False)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # The view reads message_logs; rebuilt once the new table is populated
+    op.execute("DROP MATERIALIZED VIEW IF EXISTS mv_campaign_status_counts")
+    
+    _rebuild('message_logs', 'created_at', True, MESSAGE_LOGS_FOREIGN_KEYS, MESSAGE_LOGS_INDEXES)
+    _rebuild('click_events', 'clicked_at', True, CLICK_EVENTS_FOREIGN_KEYS, CLICK_EVENTS_INDEXES)
+    
+    for statement in STATUS_COUNTS_VIEW_DDL:
+        op.execute(statement)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP MATERIALIZED VIEW IF EXISTS mv_campaign_status_counts")
+    
+    _rebuild('click_events', 'clicked_at', False, CLICK_EVENTS_FOREIGN_KEYS, CLICK_EVENTS_INDEXES)
+    _rebuild('message_logs', 'created_at', False, MESSAGE_LOGS_FOREIGN_KEYS, MESSAGE_LOGS_INDEXES)
+    
+    for statement in STATUS_COUNTS_VIEW_DDL:
+        op.execute(statement)
@@ -0,0 +1,33 @@
+"""Partial index for active smart links
+
+Revision ID: c3f7a9e2b604
+Revises: 2b8e5f0c7d91
+Create Date: 2026-10-15 17:41:56.087219
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3f7a9e2b604'
+down_revision: Union[str, Sequence[str], None] = '2b8e5f0c7d91'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.drop_index('ix_smart_links_campaign_active', table_name='smart_links')
+    op.create_index(
+        'ix_smart_links_campaign_active', 'smart_links', ['campaign_id'], unique=False,
+        postgresql_where=sa.text('is_active'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_smart_links_campaign_active', table_name='smart_links')
+    op.create_index('ix_smart_links_campaign_active', 'smart_links', ['campaign_id', 'is_active'], unique=False)
@@ -0,0 +1,37 @@
+"""Use CITEXT for users.email
+
+Revision ID: e4a81d07c6b2
+Revises: 5c9f2e71a0d3
+Create Date: 2026-10-15 15:31:12.406558
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e4a81d07c6b2'
+down_revision: Union[str, Sequence[str], None] = '5c9f2e71a0d3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS citext")
+    # uq_user_email_company and ix_users_email are rebuilt as case-insensitive
+    op.alter_column(
+        'users', 'email',
+        type_=postgresql.CITEXT(), existing_type=sa.String(length=255), existing_nullable=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.alter_column(
+        'users', 'email',
+        type_=sa.String(length=255), existing_type=postgresql.CITEXT(), existing_nullable=False,
+    )
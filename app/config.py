@@ -8,10 +8,12 @@ Design Decisions:
 - Using Pydantic Settings for type-safe configuration
 - Separate settings classes for different concerns (Database, JWT, etc.)
 - Validation happens at startup, fail-fast approach
+- Settings are frozen (immutable) after load
 - Sensitive data (SECRET_KEY) must be provided via environment
 """
 
-from typing import List
+from functools import cached_property
+from typing import FrozenSet, List, Union
 from pydantic import Field, field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 import secrets
@@ -29,7 +31,8 @@ class Settings(BaseSettings):
         env_file=".env",
         env_file_encoding="utf-8",
         case_sensitive=False,
-        extra="ignore"  # Ignore extra env vars
+        extra="ignore",  # Ignore extra env vars
+        frozen=True  # Settings are read-only after startup
     )
     
     # Application
@@ -60,6 +63,16 @@ class Settings(BaseSettings):
         default=1440,  # 24 hours
         description="JWT token expiration in minutes"
     )
+    bcrypt_rounds: int = Field(
+        default=12,
+        ge=4,
+        le=31,
+        description="bcrypt cost factor (log2 rounds) for new password hashes"
+    )
+    bcrypt_verify_cache_enabled: bool = Field(
+        default=False,
+        description="Remember successful password checks for 60s (skips repeat bcrypt work)"
+    )
     
     # Redis
     redis_url: str = Field(
@@ -68,8 +81,9 @@ class Settings(BaseSettings):
     )
     
     # CORS
-    cors_origins: List[str] = Field(
+    cors_origins: Union[List[str], FrozenSet[str]] = Field(
         default=["http://localhost:3000", "http://localhost:5173"],
+        validate_default=True,
         description="Allowed CORS origins"
     )
     
@@ -78,6 +92,10 @@ class Settings(BaseSettings):
         default=60,
         description="API rate limit per minute per user"
     )
+    rate_limit_enabled: bool = Field(
+        default=False,
+        description="Enable the global Redis-backed rate limit middleware"
+    )
     
     # WhatsApp API (for future phases)
     whatsapp_api_url: str = Field(
@@ -89,11 +107,22 @@ class Settings(BaseSettings):
         description="WhatsApp API token (optional for Phase 1)"
     )
     
+    # Campaign Analytics
+    campaign_stats_refresh_seconds: int = Field(
+        default=30,
+        ge=0,
+        description="Refresh interval for the campaign status counts view, used by the sender worker process (0 disables)"
+    )
+    
     # Smart Links
     smart_link_base_url: str = Field(
         default="http://localhost:8000/s",
         description="Base URL for smart link redirects"
     )
+    click_buffer_enabled: bool = Field(
+        default=False,
+        description="Buffer smart link clicks in Redis (flushed in the background) instead of writing each to Postgres"
+    )
     
     # GeoIP
     geoip_db_path: str = Field(
@@ -125,12 +154,23 @@ class Settings(BaseSettings):
             raise ValueError(f"Log level must be one of {allowed}")
         return v.upper()
     
-    @property
+    @field_validator("cors_origins")
+    @classmethod
+    def freeze_cors_origins(cls, v) -> FrozenSet[str]:
+        """Store origins as a frozenset for O(1) membership checks"""
+        return frozenset(v)
+    
+    @cached_property
+    def secret_key_bytes(self) -> bytes:
+        """JWT secret as UTF-8 bytes (encoded once, not per token)"""
+        return self.secret_key.encode("utf-8")
+    
+    @cached_property
     def is_production(self) -> bool:
         """Check if running in production"""
         return self.environment == "production"
     
-    @property
+    @cached_property
     def is_development(self) -> bool:
         """Check if running in development"""
         return self.environment == "development"
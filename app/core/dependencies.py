@@ -9,56 +9,250 @@ Design Decisions:
 - Multi-tenant isolation enforced at dependency level
 - Clear separation between optional and required auth
 
+Dependency Caching:
+- FastAPI caches dependency results per request (keyed by callable),
+  so get_current_user runs once per request even when a route uses
+  several dependencies built on it (get_company_context, require_admin)
+- All dependencies share the request-scoped session from get_db;
+  none of them may open their own SessionLocal()
+- User status (exists / is_active / is_admin) is cached in-process first, then in
+  Redis (shared by all workers), so a user's first request on a fresh
+  worker doesn't hit Postgres either; Redis errors fall through to the DB
+- is_admin comes from the status record, not the JWT claim, so revoking
+  admin takes effect without waiting for the token to expire
+- Committed ORM changes to a user's is_active, is_admin or password drop
+  the Redis entry and this worker's entry (session listener below); other
+  workers may serve their in-process entry for up to its 60s TTL
+
 Multi-Tenant Security:
 - All queries MUST filter by company_id
 - No cross-company data access
 - company_id extracted from JWT token (not request params)
 """
 
-from typing import Optional, Annotated
-from fastapi import Depends, HTTPException, status
-from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
-from app.database import get_db
+import threading
+from dataclasses import dataclass
+from typing import Optional, Annotated, NamedTuple
+import redis.asyncio as redis
+from cachetools import TTLCache
+from fastapi import Depends, HTTPException, Request, status
+from fastapi.security import HTTPBearer
+from redis import Redis
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session, load_only
+from starlette.concurrency import run_in_threadpool
+from app.config import settings
+from app.database import get_db, SessionLocal
+from app.models.user import User
+from app.core.logging import get_logger
 from app.core.security import extract_user_from_token
 
-# HTTP Bearer token scheme
-security = HTTPBearer()
+logger = get_logger(__name__)
+
+class BearerToken(HTTPBearer):
+    """
+    HTTPBearer that resolves to the raw token string.
+    
+    Skips building an HTTPAuthorizationCredentials model on every request,
+    while still being an HTTPBearer, so OpenAPI keeps the bearer security
+    scheme (the /docs "Authorize" button, generated clients).
+    """
+    
+    async def __call__(self, request: Request) -> Optional[str]:
+        """
+        Returns:
+            Token string, or None if the header is missing or not Bearer
+            (only with auto_error=False)
+        
+        Raises:
+            HTTPException 401: If the header is missing or not Bearer
+        """
+        authorization = request.headers.get("authorization")
+        if authorization and authorization[:7].lower() == "bearer ":
+            token = authorization[7:].strip()
+            if token:
+                return token
+        if self.auto_error:
+            raise self.make_not_authenticated_error()
+        return None
+
+
+# Same scheme_name, so both appear as the one "HTTPBearer" scheme in OpenAPI
+bearer_token = BearerToken(scheme_name="HTTPBearer")
+bearer_token_optional = BearerToken(scheme_name="HTTPBearer", auto_error=False)
+
+class UserStatus(NamedTuple):
+    """Cached auth state of a user (None stands for "user not found")"""
+    is_active: bool
+    is_admin: bool
+
+
+# Short-lived cache of user status: {user_id: UserStatus or None}
+# Keeps hot users from hitting the database on every authenticated request.
+_user_status_cache: TTLCache = TTLCache(maxsize=10_000, ttl=60)
+_user_status_lock = threading.Lock()
+
+# Shared tier: auth:user_status:{user_id} -> b"<is_active><is_admin>" as
+# 0/1 digits (b"10" active user, b"11" active admin), b"-" not found.
+# Same TTL as the in-process tier, so a change made outside the app (raw
+# SQL, no invalidation) is picked up within a minute either way.
+USER_STATUS_TTL_SECONDS = 60
+_USER_STATUS_VALUES = {
+    b"-": None,
+    b"00": UserStatus(False, False),
+    b"01": UserStatus(False, True),
+    b"10": UserStatus(True, False),
+    b"11": UserStatus(True, True),
+}
+_USER_STATUS_BYTES = {status: raw for raw, status in _USER_STATUS_VALUES.items()}
+_redis = redis.from_url(settings.redis_url, socket_connect_timeout=0.5, socket_timeout=0.5)
+# For invalidation from session events (sync, in the threadpool)
+_redis_sync = Redis.from_url(settings.redis_url, socket_connect_timeout=0.5, socket_timeout=0.5)
+
+# User columns whose change must drop the cached status
+_USER_AUTH_ATTRIBUTES = ("is_active", "is_admin", "hashed_password")
 
 
+def _user_status_key(user_id: int) -> str:
+    return f"auth:user_status:{user_id}"
+
+
+@dataclass(slots=True, frozen=True, repr=False)
 class CurrentUser:
     """
     Current authenticated user context.
     
     This object is injected into route handlers via dependency injection.
     It contains all information about the authenticated user.
+    Immutable and slotted (no per-instance __dict__), so it is cheap to
+    create per request and hashable for use as a cache key.
     
     Attributes:
         user_id: Database ID of the user
         company_id: Company ID (for multi-tenant isolation)
         email: User's email address
+        is_admin: Admin role flag (from the user status record, not the token)
     """
     
-    def __init__(self, user_id: int, company_id: int, email: str):
-        self.user_id = user_id
-        self.company_id = company_id
-        self.email = email
+    user_id: int
+    company_id: int
+    email: str
+    is_admin: bool = False
     
     def __repr__(self):
         return f"<CurrentUser user_id={self.user_id} company_id={self.company_id} email={self.email}>"
 
 
+def _load_user_status(db: Session, user_id: int) -> Optional[UserStatus]:
+    """Read a user's active/admin flags from the database (runs in the threadpool)"""
+    user = (
+        db.query(User)
+        .options(load_only(User.id, User.is_active, User.is_admin))
+        .filter(User.id == user_id)
+        .first()
+    )
+    return UserStatus(user.is_active, user.is_admin) if user else None
+
+
+async def _get_user_status(db: Session, user_id: int) -> Optional[UserStatus]:
+    """
+    Get a user's active/admin flags, using the status caches when possible.
+    
+    Lookup order: in-process TTL cache, Redis, then the users table.
+    
+    Args:
+        db: Database session
+        user_id: Database ID of the user
+    
+    Returns:
+        UserStatus, or None if the user doesn't exist
+    """
+    with _user_status_lock:
+        if user_id in _user_status_cache:
+            return _user_status_cache[user_id]
+    
+    key = _user_status_key(user_id)
+    try:
+        cached = await _redis.get(key)
+    except redis.RedisError as e:
+        logger.warning("User status cache unavailable: %s", e)
+        cached = None
+    
+    if cached in _USER_STATUS_VALUES:
+        user_status = _USER_STATUS_VALUES[cached]
+    else:
+        user_status = await run_in_threadpool(_load_user_status, db, user_id)
+        try:
+            await _redis.setex(key, USER_STATUS_TTL_SECONDS, _USER_STATUS_BYTES[user_status])
+        except redis.RedisError as e:
+            logger.warning("User status cache unavailable: %s", e)
+    
+    with _user_status_lock:
+        _user_status_cache[user_id] = user_status
+    return user_status
+
+
+def invalidate_user_cache(*user_ids: int) -> None:
+    """
+    Drop users' cached status.
+    
+    Runs automatically after a commit that changed a User's is_active,
+    is_admin or hashed_password through the ORM; call it directly after
+    Core UPDATE/DELETE statements on users, which the listener can't see.
+    Only this worker's in-process entry is dropped; other workers keep
+    theirs for at most the local TTL (60s).
+    """
+    with _user_status_lock:
+        for user_id in user_ids:
+            _user_status_cache.pop(user_id, None)
+    try:
+        _redis_sync.unlink(*(_user_status_key(user_id) for user_id in user_ids))
+    except redis.RedisError as e:
+        logger.warning("User status cache invalidation failed: %s", e)
+
+
+@event.listens_for(SessionLocal, "after_flush")
+def _collect_user_auth_changes(session, flush_context):
+    """Remember users whose auth-relevant columns this flush changed"""
+    changed = [
+        user.id for user in session.deleted if isinstance(user, User)
+    ]
+    for user in session.dirty:
+        if not isinstance(user, User):
+            continue
+        attrs = inspect(user).attrs
+        if any(attrs[name].history.has_changes() for name in _USER_AUTH_ATTRIBUTES):
+            changed.append(user.id)
+    if changed:
+        session.info.setdefault("auth_changed_user_ids", set()).update(changed)
+
+
+@event.listens_for(SessionLocal, "after_commit")
+def _invalidate_changed_users(session):
+    """Drop the cached status of users changed in the committed transaction"""
+    user_ids = session.info.pop("auth_changed_user_ids", None)
+    if user_ids:
+        invalidate_user_cache(*user_ids)
+
+
+@event.listens_for(SessionLocal, "after_rollback")
+def _discard_user_auth_changes(session):
+    session.info.pop("auth_changed_user_ids", None)
+
+
 async def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
+    token: str = Depends(bearer_token),
     db: Session = Depends(get_db)
 ) -> CurrentUser:
     """
     Dependency to get current authenticated user from JWT token.
     
     This is the primary authentication dependency used in protected routes.
+    The returned CurrentUser is cached per request by FastAPI, so it is
+    resolved once no matter how many dependencies build on it.
     
     Args:
-        credentials: Bearer token from Authorization header
+        token: Bearer token from Authorization header
         db: Database session
     
     Returns:
@@ -73,9 +267,6 @@ async def get_current_user(
         def protected_route(current_user: CurrentUser = Depends(get_current_user)):
             return {"user_id": current_user.user_id}
     """
-    # Extract token from Authorization header
-    token = credentials.credentials
-    
     # Decode and validate token
     user_info = extract_user_from_token(token)
     if not user_info:
@@ -85,17 +276,16 @@ async def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    # Verify user exists in database
-    from app.models.user import User
-    user = db.query(User).filter(User.id == user_info["user_id"]).first()
-    if not user:
+    # Verify user exists in database (cached for a short TTL)
+    user_status = await _get_user_status(db, user_info["user_id"])
+    if user_status is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User not found"
         )
     
     # Verify user is active
-    if not user.is_active:
+    if not user_status.is_active:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="User account is inactive"
@@ -105,12 +295,13 @@ async def get_current_user(
     return CurrentUser(
         user_id=user_info["user_id"],
         company_id=user_info["company_id"],
-        email=user_info["email"]
+        email=user_info["email"],
+        is_admin=user_status.is_admin
     )
 
 
 async def get_current_user_optional(
-    credentials: Optional[HTTPAuthorizationCredentials] = Depends(HTTPBearer(auto_error=False)),
+    token: Optional[str] = Depends(bearer_token_optional),
     db: Session = Depends(get_db)
 ) -> Optional[CurrentUser]:
     """
@@ -126,11 +317,11 @@ async def get_current_user_optional(
                 return {"message": f"Hello {current_user.email}"}
             return {"message": "Hello guest"}
     """
-    if not credentials:
+    if not token:
         return None
     
     try:
-        return await get_current_user(credentials, db)
+        return await get_current_user(token, db)
     except HTTPException:
         return None
 
@@ -141,6 +332,7 @@ def get_company_context(current_user: CurrentUser = Depends(get_current_user)) -
     
     This is a convenience dependency that extracts just the company_id.
     Use this when you only need company_id, not full user context.
+    Reuses the per-request cached get_current_user result (no extra query).
     
     Args:
         current_user: Current authenticated user
@@ -163,6 +355,10 @@ def require_admin(current_user: CurrentUser = Depends(get_current_user)) -> Curr
     """
     Dependency to require admin role.
     
+    The admin flag comes from the cached user status record (see
+    get_current_user), so this is an in-memory check - no extra query -
+    and a revoked admin loses access as soon as that record is dropped.
+    
     Raises:
         HTTPException 403: If user is not an admin
     
@@ -175,20 +371,12 @@ def require_admin(current_user: CurrentUser = Depends(get_current_user)) -> Curr
             # Only admins can reach here
             pass
     """
-    from app.models.user import User
-    from app.database import SessionLocal
-    
-    db = SessionLocal()
-    try:
-        user = db.query(User).filter(User.id == current_user.user_id).first()
-        if not user or not user.is_admin:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Admin access required"
-            )
-        return current_user
-    finally:
-        db.close()
+    if not current_user.is_admin:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin access required"
+        )
+    return current_user
 
 
 # Type aliases for cleaner route signatures
@@ -12,10 +12,16 @@ Design Decisions:
 
 import logging
 import sys
+from contextvars import ContextVar
 from typing import Optional
 from datetime import datetime
+import orjson
 from app.config import settings
 
+# Correlation ID of the request being handled (set by the request middleware)
+request_id_var: ContextVar[str] = ContextVar("request_id", default="-")
+
+
 # ANSI color codes for console output
 class LogColors:
     RESET = "\033[0m"
@@ -32,6 +38,9 @@ class ColoredFormatter(logging.Formatter):
     """
     Custom formatter with colors for console output.
     Makes logs easier to read during development.
+    
+    Colors are applied to a copy of the record's fields, never to the
+    LogRecord itself, so other handlers see the original values.
     """
     
     COLORS = {
@@ -42,12 +51,55 @@ class ColoredFormatter(logging.Formatter):
         logging.CRITICAL: LogColors.MAGENTA,
     }
     
-    def format(self, record):
+    def formatMessage(self, record):
         # Add color based on log level
         color = self.COLORS.get(record.levelno, LogColors.RESET)
-        record.levelname = f"{color}{record.levelname}{LogColors.RESET}"
-        record.name = f"{LogColors.BLUE}{record.name}{LogColors.RESET}"
-        return super().format(record)
+        values = dict(
+            record.__dict__,
+            levelname=f"{color}{record.levelname}{LogColors.RESET}",
+            name=f"{LogColors.BLUE}{record.name}{LogColors.RESET}",
+        )
+        return self._fmt % values
+
+
+class RequestIdFilter(logging.Filter):
+    """
+    Inject the current request ID into every log record.
+    
+    Reads request_id_var, so no caller has to pass the ID around.
+    """
+    
+    def filter(self, record):
+        record.request_id = request_id_var.get()
+        return True
+
+
+class OrjsonFormatter(logging.Formatter):
+    """
+    JSON formatter for production.
+    
+    Emits one JSON object per line, serialized with orjson
+    (much faster than the stdlib json encoder).
+    """
+    
+    def format(self, record):
+        data = {
+            "ts": record.created,
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+            "request_id": getattr(record, "request_id", None),
+        }
+        http = getattr(record, "http", None)
+        if http is not None:
+            data["http"] = http
+        if record.exc_info:
+            data["exc_info"] = self.formatException(record.exc_info)
+        return orjson.dumps(data).decode()
+
+
+# Set once setup_logging() has run in this process
+_configured = False
 
 
 def setup_logging():
@@ -56,17 +108,26 @@ def setup_logging():
     
     - Development: Colored console output with DEBUG level
     - Production: JSON format with INFO level
+    
+    Idempotent: only the first call in a process configures handlers, so
+    repeated calls (reload, tests) neither duplicate handlers nor remove
+    handlers attached by other libraries. Runs on import of this module,
+    so every entry point (API, workers, Alembic, scripts) gets it.
     """
+    global _configured, _log_request_impl
+    if _configured:
+        return
+    
+    level = getattr(logging, settings.log_level)
+    
     # Root logger configuration
     root_logger = logging.getLogger()
-    root_logger.setLevel(getattr(logging, settings.log_level))
-    
-    # Remove existing handlers
-    root_logger.handlers.clear()
+    root_logger.setLevel(level)
     
     # Console handler
     console_handler = logging.StreamHandler(sys.stdout)
-    console_handler.setLevel(getattr(logging, settings.log_level))
+    console_handler.setLevel(level)
+    console_handler.addFilter(RequestIdFilter())
     
     # Format
     if settings.is_development:
@@ -75,12 +136,11 @@ def setup_logging():
             fmt="%(asctime)s | %(levelname)-8s | %(name)s | %(message)s",
             datefmt="%Y-%m-%d %H:%M:%S"
         )
+        _log_request_impl = _log_request_text
     else:
-        # Simple format for production (use JSON logger in real prod)
-        formatter = logging.Formatter(
-            fmt="%(asctime)s | %(levelname)-8s | %(name)s | %(message)s",
-            datefmt="%Y-%m-%d %H:%M:%S"
-        )
+        # JSON format for production
+        formatter = OrjsonFormatter()
+        _log_request_impl = _log_request_json
     
     console_handler.setFormatter(formatter)
     root_logger.addHandler(console_handler)
@@ -88,6 +148,8 @@ def setup_logging():
     # Silence noisy third-party loggers
     logging.getLogger("uvicorn.access").setLevel(logging.WARNING)
     logging.getLogger("sqlalchemy.engine").setLevel(logging.WARNING)
+    
+    _configured = True
 
 
 def get_logger(name: str) -> logging.Logger:
@@ -107,18 +169,51 @@ def get_logger(name: str) -> logging.Logger:
     return logging.getLogger(name)
 
 
-# Initialize logging on module import
-setup_logging()
-
 # Module logger
 logger = get_logger(__name__)
 
 
-# Request logging helper
+# Request logging helpers
+def _log_request_text(method: str, path: str, status_code: int, duration_ms: float, user_id: Optional[int] = None):
+    """Text request log line (development)"""
+    if not logger.isEnabledFor(logging.INFO):
+        return
+    
+    user_info = f"user_id={user_id}" if user_id else "anonymous"
+    logger.info(
+        "%s %s - %s - %.2fms - %s",
+        method, path, status_code, duration_ms, user_info
+    )
+
+
+def _log_request_json(method: str, path: str, status_code: int, duration_ms: float, user_id: Optional[int] = None):
+    """Structured request log record (production, rendered by OrjsonFormatter)"""
+    if not logger.isEnabledFor(logging.INFO):
+        return
+    
+    logger.info(
+        "%s %s - %s", method, path, status_code,
+        extra={"http": {
+            "method": method,
+            "path": path,
+            "status_code": status_code,
+            "duration_ms": round(duration_ms, 2),
+            "user_id": user_id,
+        }}
+    )
+
+
+# Request logger implementation, chosen once by setup_logging()
+_log_request_impl = _log_request_text
+
+
 def log_request(method: str, path: str, status_code: int, duration_ms: float, user_id: Optional[int] = None):
     """
     Log HTTP request with structured data.
     
+    Delegates to the text or JSON implementation selected by
+    setup_logging(), so the per-request path does no environment checks.
+    
     Args:
         method: HTTP method (GET, POST, etc.)
         path: Request path
@@ -126,10 +221,7 @@ def log_request(method: str, path: str, status_code: int, duration_ms: float, us
         duration_ms: Request duration in milliseconds
         user_id: Optional user ID
     """
-    user_info = f"user_id={user_id}" if user_id else "anonymous"
-    logger.info(
-        f"{method} {path} - {status_code} - {duration_ms:.2f}ms - {user_info}"
-    )
+    _log_request_impl(method, path, status_code, duration_ms, user_id)
 
 
 # Error logging helper
@@ -141,8 +233,18 @@ def log_error(error: Exception, context: Optional[dict] = None):
         error: Exception instance
         context: Optional context dict (user_id, company_id, etc.)
     """
-    context_str = f" | Context: {context}" if context else ""
-    logger.error(f"{type(error).__name__}: {str(error)}{context_str}", exc_info=True)
+    if context:
+        logger.error(
+            "%s: %s | Context: %s", type(error).__name__, error, context,
+            exc_info=True
+        )
+    else:
+        logger.error("%s: %s", type(error).__name__, error, exc_info=True)
+
+
+# Initialize logging on module import (after _log_request_impl is defined,
+# which setup_logging() overrides)
+setup_logging()
 
 
 if __name__ == "__main__":
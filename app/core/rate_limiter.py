@@ -7,56 +7,88 @@ Design Decisions:
 - In-memory storage (Redis-based in production)
 - Per-user rate limiting
 - Configurable limits per endpoint
-- Sliding window algorithm
+- Fixed-window counter algorithm (constant memory per key)
 
 Production Consideration:
-- This uses in-memory dict (not suitable for multi-process)
-- In production, use Redis with redis-py or slowapi
+- RateLimiter uses in-memory dict (not suitable for multi-process)
+- RateLimitMiddleware enforces a global per-client limit in Redis
+  (one pipelined INCR + EXPIRE round-trip per request)
 - For Phase 1, this is sufficient for demo purposes
 """
 
+import asyncio
+import threading
 import time
-from typing import Dict, Tuple
+from typing import Dict, List, Tuple
 from collections import defaultdict
-from fastapi import HTTPException, status
+import redis.asyncio as redis
+from fastapi import HTTPException, Request, status
+from fastapi.responses import JSONResponse
+from starlette.middleware.base import BaseHTTPMiddleware
 from app.config import settings
 from app.core.logging import get_logger
+from app.core.security import extract_user_from_token
 
 logger = get_logger(__name__)
 
+# Default limit, read once (settings are frozen) to keep the hot path off pydantic attribute access
+_RATE_LIMIT = settings.rate_limit_per_minute
+
 
 class RateLimiter:
     """
-    Simple in-memory rate limiter using sliding window.
+    Simple in-memory rate limiter using a fixed-window counter.
     
     Tracks requests per user/IP and enforces limits.
+    Each key stores only a request count and the window start time,
+    so memory per key is constant regardless of the limit.
+    The layout maps directly onto Redis INCR + EXPIRE for production.
+    
+    Thread-safe: sync endpoints run in FastAPI's threadpool, so bucket
+    updates are guarded by striped locks (one of LOCK_STRIPES, picked by
+    key hash) to avoid a single global lock becoming a contention point.
     
     Attributes:
-        requests: Dict mapping (identifier, endpoint) -> list of timestamps
+        buckets: Dict mapping (identifier, endpoint) -> [count, window_start]
     """
     
+    LOCK_STRIPES = 64  # Must be a power of two
+    
     def __init__(self):
-        # Storage: {(identifier, endpoint): [timestamp1, timestamp2, ...]}
-        self.requests: Dict[Tuple[str, str], list] = defaultdict(list)
+        # Storage: {(identifier, endpoint): [count, window_start]}
+        # window_start uses time.monotonic() so clock jumps (NTP, DST) do not skew windows
+        self.buckets: Dict[Tuple[str, str], List[float]] = defaultdict(lambda: [0, float("-inf")])
+        self._locks = [threading.Lock() for _ in range(self.LOCK_STRIPES)]
+        # Longest window seen so far (used by sweep to find idle keys)
+        self._max_window = 60
     
-    def _clean_old_requests(self, identifier: str, endpoint: str, window_seconds: int):
+    def _lock_for(self, identifier: str, endpoint: str) -> threading.Lock:
+        """Get the lock stripe guarding a key"""
+        return self._locks[hash((identifier, endpoint)) & (self.LOCK_STRIPES - 1)]
+    
+    def _get_bucket(self, identifier: str, endpoint: str, window_seconds: int) -> List[float]:
         """
-        Remove timestamps older than the window.
+        Get the counter bucket for a key, starting a new window if expired.
         
         Args:
             identifier: User ID or IP address
             endpoint: API endpoint path
             window_seconds: Time window in seconds
+        
+        Returns:
+            [count, window_start] bucket for the current window
         """
-        key = (identifier, endpoint)
-        current_time = time.time()
-        cutoff_time = current_time - window_seconds
+        bucket = self.buckets[(identifier, endpoint)]
+        current_time = time.monotonic()
+        if window_seconds > self._max_window:
+            self._max_window = window_seconds
         
-        # Keep only recent requests
-        self.requests[key] = [
-            ts for ts in self.requests[key]
-            if ts > cutoff_time
-        ]
+        # Start a fresh window once the current one has elapsed
+        if current_time - bucket[1] >= window_seconds:
+            bucket[0] = 0
+            bucket[1] = current_time
+        
+        return bucket
     
     def check_rate_limit(
         self,
@@ -78,25 +110,38 @@ class RateLimiter:
             True if within limit, False if exceeded
         """
         if max_requests is None:
-            max_requests = settings.rate_limit_per_minute
+            max_requests = _RATE_LIMIT
         
-        # Clean old requests
-        self._clean_old_requests(identifier, endpoint, window_seconds)
+        with self._lock_for(identifier, endpoint):
+            bucket = self._get_bucket(identifier, endpoint, window_seconds)
+            
+            # Check current count
+            current_count = bucket[0]
+            if current_count < max_requests:
+                # Record this request
+                bucket[0] = current_count + 1
+                return True
         
-        # Check current count
-        key = (identifier, endpoint)
-        current_count = len(self.requests[key])
+        logger.warning(
+            "Rate limit exceeded for %s on %s: %s/%s requests in %ss",
+            identifier, endpoint, current_count, max_requests, window_seconds
+        )
+        return False
+    
+    def increment(self, identifier: str, endpoint: str, window_seconds: int = 60) -> int:
+        """
+        Count a request without enforcing a limit.
         
-        if current_count >= max_requests:
-            logger.warning(
-                f"Rate limit exceeded for {identifier} on {endpoint}: "
-                f"{current_count}/{max_requests} requests in {window_seconds}s"
-            )
-            return False
+        For callers that apply their own limit to the returned count
+        (e.g. RateLimitMiddleware when Redis is unavailable).
         
-        # Record this request
-        self.requests[key].append(time.time())
-        return True
+        Returns:
+            Number of requests in the current window, including this one
+        """
+        with self._lock_for(identifier, endpoint):
+            bucket = self._get_bucket(identifier, endpoint, window_seconds)
+            bucket[0] += 1
+            return bucket[0]
     
     def get_remaining(
         self,
@@ -118,12 +163,52 @@ class RateLimiter:
             Number of remaining requests
         """
         if max_requests is None:
-            max_requests = settings.rate_limit_per_minute
+            max_requests = _RATE_LIMIT
+        
+        with self._lock_for(identifier, endpoint):
+            bucket = self._get_bucket(identifier, endpoint, window_seconds)
+            return max(0, max_requests - bucket[0])
+    
+    def sweep(self) -> int:
+        """
+        Evict keys that have been idle longer than the longest window.
+        
+        Keys are otherwise only touched when the same (identifier, endpoint)
+        is hit again, so without sweeping the dict grows without bound.
+        Evicting an expired bucket is equivalent to resetting it.
+        
+        Returns:
+            Number of keys evicted
+        """
+        cutoff_time = time.monotonic() - self._max_window
+        removed = 0
+        
+        for key, bucket in list(self.buckets.items()):
+            if bucket[1] >= cutoff_time:
+                continue
+            with self._lock_for(*key):
+                # Re-check under the lock in case the key was just used
+                bucket = self.buckets.get(key)
+                if bucket is not None and bucket[1] < cutoff_time:
+                    del self.buckets[key]
+                    removed += 1
+        
+        return removed
+    
+    async def run_sweeper(self, interval_seconds: int = 300):
+        """
+        Background task that periodically calls sweep().
         
-        self._clean_old_requests(identifier, endpoint, window_seconds)
-        key = (identifier, endpoint)
-        current_count = len(self.requests[key])
-        return max(0, max_requests - current_count)
+        Usage (application lifespan):
+            task = asyncio.create_task(rate_limiter.run_sweeper())
+            ...
+            task.cancel()
+        """
+        while True:
+            await asyncio.sleep(interval_seconds)
+            removed = self.sweep()
+            if removed:
+                logger.debug("Rate limiter swept %s idle key(s)", removed)
     
     def reset(self, identifier: str = None, endpoint: str = None):
         """
@@ -136,11 +221,10 @@ class RateLimiter:
         If both are None, resets all counters.
         """
         if identifier is None and endpoint is None:
-            self.requests.clear()
+            self.buckets.clear()
         elif identifier and endpoint:
-            key = (identifier, endpoint)
-            if key in self.requests:
-                del self.requests[key]
+            with self._lock_for(identifier, endpoint):
+                self.buckets.pop((identifier, endpoint), None)
 
 
 # Global rate limiter instance
@@ -179,13 +263,94 @@ def check_rate_limit(
             status_code=status.HTTP_429_TOO_MANY_REQUESTS,
             detail=f"Rate limit exceeded. Try again later.",
             headers={
-                "X-RateLimit-Limit": str(max_requests or settings.rate_limit_per_minute),
+                "X-RateLimit-Limit": str(max_requests or _RATE_LIMIT),
                 "X-RateLimit-Remaining": str(remaining),
                 "X-RateLimit-Reset": str(int(time.time() + window_seconds))
             }
         )
 
 
+# INCR and start the window's TTL atomically (EXPIRE ... NX needs Redis 7)
+_INCR_WINDOW_SCRIPT = """
+local count = redis.call('INCR', KEYS[1])
+if count == 1 then
+    redis.call('EXPIRE', KEYS[1], ARGV[1])
+end
+return count
+"""
+
+
+class RateLimitMiddleware(BaseHTTPMiddleware):
+    """
+    Global per-client rate limiting backed by Redis.
+    
+    Each request costs a single round-trip on a fixed-window key (a small
+    Lua script: INCR, plus EXPIRE when the window starts; works on Redis
+    6), instead of one rate check per route/dependency.
+    Clients are identified by the user ID in a valid Bearer token
+    (extract_user_from_token, cached per token; auth dependencies run
+    after middleware), otherwise by client IP, so users behind a shared
+    NAT/proxy get their own limits. If Redis is unreachable (0.5s
+    timeouts), falls back to the in-memory rate_limiter so requests are
+    still limited per process.
+    
+    Usage:
+        app.add_middleware(RateLimitMiddleware)
+    """
+    
+    def __init__(self, app, max_requests: int = None, window_seconds: int = 60):
+        super().__init__(app)
+        self.max_requests = max_requests or _RATE_LIMIT
+        self.window_seconds = window_seconds
+        self.redis = redis.from_url(
+            settings.redis_url, socket_connect_timeout=0.5, socket_timeout=0.5
+        )
+        # EVALSHA, falling back to EVAL the first time on each server
+        self._incr_window = self.redis.register_script(_INCR_WINDOW_SCRIPT)
+    
+    async def _increment(self, identifier: str) -> int:
+        """Count this request and return the count for the current window"""
+        key = f"ratelimit:{identifier}"
+        try:
+            return await self._incr_window(keys=[key], args=[self.window_seconds])
+        except redis.RedisError as e:
+            logger.warning("Rate limit Redis unavailable, using in-memory limiter: %s", e)
+            return rate_limiter.increment(identifier, "*", self.window_seconds)
+    
+    @staticmethod
+    def _identify(request: Request) -> str:
+        """Rate limit key: the token's user if it is valid, else the client IP"""
+        authorization = request.headers.get("authorization")
+        if authorization and authorization[:7].lower() == "bearer ":
+            user_info = extract_user_from_token(authorization[7:].strip())
+            if user_info:
+                return f"user:{user_info['user_id']}"
+        return f"ip:{request.client.host if request.client else 'unknown'}"
+    
+    async def dispatch(self, request: Request, call_next):
+        identifier = self._identify(request)
+        
+        count = await self._increment(identifier)
+        remaining = max(0, self.max_requests - count)
+        headers = {
+            "X-RateLimit-Limit": str(self.max_requests),
+            "X-RateLimit-Remaining": str(remaining),
+        }
+        
+        if count > self.max_requests:
+            logger.warning("Rate limit exceeded for %s: %s/%s", identifier, count, self.max_requests)
+            headers["Retry-After"] = str(self.window_seconds)
+            return JSONResponse(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                content={"detail": "Rate limit exceeded. Try again later."},
+                headers=headers
+            )
+        
+        response = await call_next(request)
+        response.headers.update(headers)
+        return response
+
+
 # Decorator for rate limiting (alternative approach)
 def rate_limit(max_requests: int = None, window_seconds: int = 60):
     """
@@ -0,0 +1,32 @@
+"""
+Responses Module
+
+orjson-backed JSON response that serializes ORM instances directly.
+
+Design Decisions:
+- Models list their public attributes in a `_json_fields` tuple; the
+  encoder builds {name: getattr(obj, name)} from it, so there is no
+  per-model to_dict() and no jsonable_encoder pass
+- datetimes and enums are left to orjson, which encodes both natively
+- Columns not listed (passwords, API credentials) are never serialized
+"""
+
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
+
+
+def _encode_model(obj: Any) -> Any:
+    """orjson `default` hook: serialize objects that declare _json_fields"""
+    fields = getattr(type(obj), "_json_fields", None)
+    if fields is None:
+        raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+    return {name: getattr(obj, name) for name in fields}
+
+
+class ORJSONResponse(JSONResponse):
+    """JSON response rendered with orjson; accepts models with _json_fields"""
+    
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, default=_encode_model, option=orjson.OPT_NON_STR_KEYS)
@@ -16,12 +16,70 @@ Security Best Practices:
 - Constant-time password verification (bcrypt handles this)
 """
 
-from datetime import datetime, timedelta
+import asyncio
+import hashlib
+import hmac
+import os
+import secrets
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
 from typing import Optional, Dict, Any
-from jose import JWTError, jwt
+from cachetools import TTLCache
+import jwt
+from jwt import InvalidTokenError
 import bcrypt
 from app.config import settings
 
+# JWT signing key and options, resolved once (settings are frozen) instead of
+# on every encode/decode call
+_JWT_KEY = settings.secret_key_bytes
+_JWT_ALGORITHM = settings.algorithm
+_JWT_ALGORITHMS = [_JWT_ALGORITHM]
+_DEFAULT_EXPIRE_SECONDS = settings.access_token_expire_minutes * 60
+
+# bcrypt is called directly (no passlib CryptContext scheme dispatch)
+_BCRYPT_ROUNDS = settings.bcrypt_rounds
+_VERIFY_CACHE_ENABLED = settings.bcrypt_verify_cache_enabled
+# We never issue an "aud" claim, so skip audience validation
+_JWT_DECODE_OPTIONS = {"verify_aud": False}
+
+# Verified token payloads: {sha256(token)[:16]: (payload, exp)}
+# Clients reuse one token for its whole lifetime, so this skips signature
+# verification and JSON parsing on repeat requests. Keyed by a digest so
+# raw tokens are not held in memory.
+_token_cache: TTLCache = TTLCache(maxsize=10_000, ttl=_DEFAULT_EXPIRE_SECONDS)
+# Post-processed user info per token: {sha256(token)[:16]: (user_info, exp)}
+_user_info_cache: TTLCache = TTLCache(maxsize=10_000, ttl=_DEFAULT_EXPIRE_SECONDS)
+_token_cache_lock = threading.Lock()
+
+
+def _token_cache_key(token: str) -> bytes:
+    """
+    Cache key for a token (truncated SHA-256, so raw tokens aren't stored).
+    
+    Timing: cache lookups compare these digests, never the attacker-supplied
+    token, so an early-exit byte compare leaks nothing an attacker can steer
+    (they can't choose digest prefixes). Any direct comparison of secrets or
+    tokens added to this module must use hmac.compare_digest instead of ==
+    (cf. the memcmp HMAC check in OpenVPN, CVE-2013-2061).
+    """
+    return hashlib.sha256(token.encode("utf-8")).digest()[:16]
+
+# Successful password checks (only used if bcrypt_verify_cache_enabled).
+# Keys are HMAC-SHA256(process-random key, password + hash), so plaintext
+# passwords never live in the cache. Only successes are cached.
+_verify_cache: TTLCache = TTLCache(maxsize=4096, ttl=60)
+_verify_cache_key = secrets.token_bytes(32)
+_verify_cache_lock = threading.Lock()
+
+# Dedicated pool for bcrypt. bcrypt releases the GIL, so threads run it in
+# parallel across cores without taking slots from the DB-bound threadpool.
+_bcrypt_executor = ThreadPoolExecutor(
+    max_workers=os.cpu_count() or 1, thread_name_prefix="bcrypt"
+)
+
 
 def hash_password(password: str) -> str:
     """
@@ -41,7 +99,7 @@ def hash_password(password: str) -> str:
     password_bytes = password.encode('utf-8')
     
     # Generate salt and hash
-    salt = bcrypt.gensalt()
+    salt = bcrypt.gensalt(rounds=_BCRYPT_ROUNDS)
     hashed = bcrypt.hashpw(password_bytes, salt)
     
     # Return as string
@@ -60,14 +118,74 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
         True if password matches, False otherwise
     
     Security:
-        Uses constant-time comparison to prevent timing attacks
+        Uses constant-time comparison to prevent timing attacks.
+        With bcrypt_verify_cache_enabled, a successful check is remembered
+        for 60s. This trades away part of bcrypt's "slow by design"
+        property for repeat logins, so it is off by default.
     """
     # Convert to bytes
     password_bytes = plain_password.encode('utf-8')
     hashed_bytes = hashed_password.encode('utf-8')
     
-    # Verify
-    return bcrypt.checkpw(password_bytes, hashed_bytes)
+    if not _VERIFY_CACHE_ENABLED:
+        return bcrypt.checkpw(password_bytes, hashed_bytes)
+    
+    cache_key = _verify_cache_key_for(password_bytes, hashed_bytes)
+    with _verify_cache_lock:
+        if cache_key in _verify_cache:
+            return True
+    
+    return _checkpw_and_cache(password_bytes, hashed_bytes, cache_key)
+
+
+def _verify_cache_key_for(password_bytes: bytes, hashed_bytes: bytes) -> bytes:
+    """
+    Verify cache key. Including the stored hash means a password change
+    (new hash) invalidates cached successes without any version bookkeeping.
+    """
+    return hmac.new(
+        _verify_cache_key, password_bytes + b"\0" + hashed_bytes, hashlib.sha256
+    ).digest()
+
+
+def _checkpw_and_cache(password_bytes: bytes, hashed_bytes: bytes, cache_key: bytes) -> bool:
+    """Run bcrypt and remember a success in the verify cache"""
+    verified = bcrypt.checkpw(password_bytes, hashed_bytes)
+    if verified:
+        with _verify_cache_lock:
+            _verify_cache[cache_key] = True
+    return verified
+
+
+async def hash_password_async(password: str) -> str:
+    """hash_password on the bcrypt pool, for use from async handlers"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_bcrypt_executor, hash_password, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """
+    verify_password on the bcrypt pool, for use from async handlers.
+    
+    A verify cache hit is answered on the event loop, without a hop to
+    the bcrypt pool.
+    """
+    loop = asyncio.get_running_loop()
+    if not _VERIFY_CACHE_ENABLED:
+        return await loop.run_in_executor(
+            _bcrypt_executor, verify_password, plain_password, hashed_password
+        )
+    
+    password_bytes = plain_password.encode('utf-8')
+    hashed_bytes = hashed_password.encode('utf-8')
+    cache_key = _verify_cache_key_for(password_bytes, hashed_bytes)
+    with _verify_cache_lock:
+        if cache_key in _verify_cache:
+            return True
+    
+    return await loop.run_in_executor(
+        _bcrypt_executor, _checkpw_and_cache, password_bytes, hashed_bytes, cache_key
+    )
 
 
 def create_access_token(data: Dict[str, Any], expires_delta: Optional[timedelta] = None) -> str:
@@ -95,26 +213,22 @@ def create_access_token(data: Dict[str, Any], expires_delta: Optional[timedelta]
             data={"sub": "123", "company_id": "456", "email": "user@example.com"}
         )
     """
-    to_encode = data.copy()
-    
-    # Set expiration time
+    # One clock read; PyJWT accepts integer epoch seconds for exp/iat
+    now = int(time.time())
     if expires_delta:
-        expire = datetime.utcnow() + expires_delta
+        expire = now + int(expires_delta.total_seconds())
     else:
-        expire = datetime.utcnow() + timedelta(minutes=settings.access_token_expire_minutes)
+        expire = now + _DEFAULT_EXPIRE_SECONDS
     
     # Add standard JWT claims
-    to_encode.update({
+    to_encode = {
+        **data,
         "exp": expire,  # Expiration time
-        "iat": datetime.utcnow()  # Issued at time
-    })
+        "iat": now  # Issued at time
+    }
     
     # Encode token
-    encoded_jwt = jwt.encode(
-        to_encode,
-        settings.secret_key,
-        algorithm=settings.algorithm
-    )
+    encoded_jwt = jwt.encode(to_encode, _JWT_KEY, algorithm=_JWT_ALGORITHM)
     
     return encoded_jwt
 
@@ -134,25 +248,47 @@ def decode_access_token(token: str) -> Optional[Dict[str, Any]]:
         - Expiration check
         - Algorithm check
     
+    Valid payloads are cached until their "exp" claim; expiry is re-checked
+    on every cache hit. Invalid tokens are never cached. The returned dict
+    may be shared between calls - treat it as read-only.
+    
     Example:
         payload = decode_access_token(token)
         if payload:
             user_id = payload.get("sub")
             company_id = payload.get("company_id")
     """
+    cache_key = _token_cache_key(token)
+    
+    with _token_cache_lock:
+        cached = _token_cache.get(cache_key)
+    if cached is not None:
+        payload, exp = cached
+        if exp > time.time():
+            return payload
+        with _token_cache_lock:
+            _token_cache.pop(cache_key, None)
+        return None
+    
     try:
         payload = jwt.decode(
             token,
-            settings.secret_key,
-            algorithms=[settings.algorithm]
+            _JWT_KEY,
+            algorithms=_JWT_ALGORITHMS,
+            options=_JWT_DECODE_OPTIONS
         )
-        return payload
-    except JWTError:
+    except InvalidTokenError:
         # Invalid token, expired, or signature mismatch
         return None
+    
+    exp = payload.get("exp")
+    if isinstance(exp, (int, float)):
+        with _token_cache_lock:
+            _token_cache[cache_key] = (payload, exp)
+    return payload
 
 
-def create_user_token(user_id: int, company_id: int, email: str) -> str:
+def create_user_token(user_id: int, company_id: int, email: str, is_admin: bool = False) -> str:
     """
     Convenience function to create a token for a user.
     
@@ -160,6 +296,8 @@ def create_user_token(user_id: int, company_id: int, email: str) -> str:
         user_id: User's database ID
         company_id: User's company ID (for multi-tenancy)
         email: User's email
+        is_admin: User's admin flag (informational; require_admin checks the
+            users table via the cached status record)
     
     Returns:
         JWT token string
@@ -169,7 +307,8 @@ def create_user_token(user_id: int, company_id: int, email: str) -> str:
     token_data = {
         "sub": str(user_id),  # Subject (user ID)
         "company_id": str(company_id),
-        "email": email
+        "email": email,
+        "is_admin": is_admin
     }
     return create_access_token(data=token_data)
 
@@ -182,7 +321,8 @@ def extract_user_from_token(token: str) -> Optional[Dict[str, Any]]:
         token: JWT token string
     
     Returns:
-        Dict with user_id, company_id, email if valid, None otherwise
+        Dict with user_id, company_id, email, is_admin if valid, None otherwise
+        (cached per token until it expires - treat as read-only)
     
     Example:
         user_info = extract_user_from_token(token)
@@ -190,18 +330,40 @@ def extract_user_from_token(token: str) -> Optional[Dict[str, Any]]:
             print(f"User ID: {user_info['user_id']}")
             print(f"Company ID: {user_info['company_id']}")
     """
+    cache_key = _token_cache_key(token)
+    with _token_cache_lock:
+        cached = _user_info_cache.get(cache_key)
+    if cached is not None and cached[1] > time.time():
+        return cached[0]
+    
     payload = decode_access_token(token)
     if not payload:
         return None
     
-    return {
+    user_info = {
         "user_id": int(payload.get("sub")),
         "company_id": int(payload.get("company_id")),
-        "email": payload.get("email")
+        "email": payload.get("email"),
+        "is_admin": bool(payload.get("is_admin", False))
     }
+    
+    exp = payload.get("exp")
+    if isinstance(exp, (int, float)):
+        with _token_cache_lock:
+            _user_info_cache[cache_key] = (user_info, exp)
+    return user_info
 
 
 # Password validation
+
+# Character class bits per ASCII byte: 1 = uppercase, 2 = lowercase, 4 = digit
+_UPPER, _LOWER, _DIGIT = 1, 2, 4
+_CHAR_CLASS = bytes(
+    _UPPER if 65 <= b <= 90 else _LOWER if 97 <= b <= 122 else _DIGIT if 48 <= b <= 57 else 0
+    for b in range(256)
+)
+
+
 def validate_password_strength(password: str) -> tuple[bool, str]:
     """
     Validate password strength.
@@ -226,13 +388,27 @@ def validate_password_strength(password: str) -> tuple[bool, str]:
     if len(password) < 8:
         return False, "Password must be at least 8 characters long"
     
-    if not any(c.isupper() for c in password):
+    if password.isascii():
+        # Single pass: OR together the class bits of every byte
+        classes = 0
+        for b in password.encode("ascii"):
+            classes |= _CHAR_CLASS[b]
+        has_upper = classes & _UPPER
+        has_lower = classes & _LOWER
+        has_digit = classes & _DIGIT
+    else:
+        # Unicode passwords need str methods to classify non-ASCII letters
+        has_upper = any(c.isupper() for c in password)
+        has_lower = any(c.islower() for c in password)
+        has_digit = any(c.isdigit() for c in password)
+    
+    if not has_upper:
         return False, "Password must contain at least one uppercase letter"
     
-    if not any(c.islower() for c in password):
+    if not has_lower:
         return False, "Password must contain at least one lowercase letter"
     
-    if not any(c.isdigit() for c in password):
+    if not has_digit:
         return False, "Password must contain at least one digit"
     
     return True, ""
@@ -15,12 +15,18 @@ Multi-tenant Consideration:
 - No cross-company data leakage
 """
 
+import logging
+from datetime import date
 from typing import Generator
-from sqlalchemy import create_engine, event, MetaData, text
+from sqlalchemy import create_engine, event, func, MetaData, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.exc import DBAPIError
 from sqlalchemy.orm import sessionmaker, Session, declarative_base
 from sqlalchemy.pool import QueuePool
 from app.config import settings
 
+logger = logging.getLogger(__name__)
+
 # Naming convention for constraints (helps with Alembic migrations)
 # This ensures consistent naming across different databases
 convention = {
@@ -36,6 +42,11 @@ metadata = MetaData(naming_convention=convention)
 # Declarative Base for all ORM models
 Base = declarative_base(metadata=metadata)
 
+# Timestamp default/onupdate evaluated by Postgres instead of a Python
+# datetime.utcnow() per row. Columns stay naive UTC (timestamp without
+# time zone), so comparisons against datetime.utcnow() keep working.
+utc_now = func.timezone("utc", func.now())
+
 
 # Database Engine Configuration
 def create_db_engine():
@@ -51,8 +62,10 @@ def create_db_engine():
         settings.database_url,
         echo=settings.db_echo,  # Log SQL queries in development
         poolclass=QueuePool,
-        pool_size=5,  # Number of connections to maintain
-        max_overflow=10,  # Max connections beyond pool_size
+        # Sync routes run on anyio's 40-thread pool; size the pool so every
+        # worker thread can hold a connection instead of queueing on checkout
+        pool_size=20,  # Number of connections to maintain
+        max_overflow=20,  # Max connections beyond pool_size
         pool_pre_ping=True,  # Verify connections before using
         pool_recycle=3600,  # Recycle connections after 1 hour
     )
@@ -106,32 +119,87 @@ def init_db() -> None:
     - Testing
     - Quick prototyping
     
+    Extensions are not created here (that needs superuser/owner rights on
+    every startup): users.email is CITEXT, so a fresh database needs
+    "CREATE EXTENSION citext" first - run the Alembic migrations, or create
+    it once as the database owner.
+    
     Usage:
         from app.database import init_db
         init_db()
     """
-    from sqlalchemy import inspect
-    
     # Import all models here to ensure they're registered with Base
     from app.models import (
         user, company, campaign, recipient, 
-        message_log, smart_link, click_event, integration
+        message_log, smart_link, smart_link_unique_ip, click_event, user_agent_signature, integration
     )
     
-    # Check which tables already exist
-    inspector = inspect(engine)
-    existing_tables = inspector.get_table_names()
+    with engine.begin() as conn:
+        # One catalog query instead of inspector + create_all's per-table check
+        existing_tables = set(conn.execute(text(
+            "SELECT table_name FROM information_schema.tables "
+            "WHERE table_schema = current_schema()"
+        )).scalars())
+        
+        tables_to_create = [
+            table for name, table in Base.metadata.tables.items()
+            if name not in existing_tables
+        ]
+        
+        if tables_to_create:
+            logger.info(
+                "Creating %d table(s): %s",
+                len(tables_to_create), ", ".join(t.name for t in tables_to_create)
+            )
+            Base.metadata.create_all(bind=conn, tables=tables_to_create, checkfirst=False)
+            logger.info("Database tables created successfully")
+        else:
+            logger.info("All database tables already exist")
+        
+        # Partitions and materialized views aren't part of Base.metadata
+        create_monthly_partitions(conn, "message_logs")
+        create_monthly_partitions(conn, "click_events")
+        message_log.create_campaign_status_counts_view(conn)
+
+
+def create_monthly_partitions(conn: Connection, table_name: str, months_ahead: int = 12) -> None:
+    """
+    Create the DEFAULT partition and monthly range partitions of a table.
     
-    # Get tables that need to be created
-    all_tables = Base.metadata.tables.keys()
-    tables_to_create = [t for t in all_tables if t not in existing_tables]
+    Covers the current month plus `months_ahead`; rows outside that window
+    land in <table>_default. Idempotent, and a no-op for tables that aren't
+    partitioned (i.e. created before the partitioning migration).
     
-    if tables_to_create:
-        print(f"📋 Creating {len(tables_to_create)} table(s): {', '.join(tables_to_create)}")
-        Base.metadata.create_all(bind=engine)
-        print("✅ Database tables created successfully")
-    else:
-        print("✅ All database tables already exist")
+    Args:
+        conn: Connection inside a transaction
+        table_name: Parent table, partitioned BY RANGE on a timestamp
+        months_ahead: How many months past the current one to pre-create
+    """
+    is_partitioned = conn.execute(
+        text("SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(:name)"),
+        {"name": table_name},
+    ).first()
+    if not is_partitioned:
+        return
+    
+    conn.execute(text(f"CREATE TABLE IF NOT EXISTS {table_name}_default PARTITION OF {table_name} DEFAULT"))
+    
+    today = date.today()
+    year, month = today.year, today.month
+    for _ in range(months_ahead + 1):
+        next_year, next_month = (year + 1, 1) if month == 12 else (year, month + 1)
+        try:
+            # Savepoint: fails if the default partition already holds rows
+            # for this month; that shouldn't take the whole startup down
+            with conn.begin_nested():
+                conn.execute(text(
+                    f"CREATE TABLE IF NOT EXISTS {table_name}_y{year}m{month:02d} "
+                    f"PARTITION OF {table_name} "
+                    f"FOR VALUES FROM ('{year}-{month:02d}-01') TO ('{next_year}-{next_month:02d}-01')"
+                ))
+        except DBAPIError as e:
+            logger.warning("Could not create %s partition for %d-%02d: %s", table_name, year, month, e)
+        year, month = next_year, next_month
 
 
 def drop_db() -> None:
@@ -145,25 +213,32 @@ def drop_db() -> None:
         raise RuntimeError("Cannot drop database in production!")
     
     Base.metadata.drop_all(bind=engine)
-    print("⚠️ All database tables dropped")
+    logger.warning("All database tables dropped")
 
 
 # Event Listeners for PostgreSQL optimizations
 @event.listens_for(engine, "connect")
-def set_sqlite_pragma(dbapi_conn, connection_record):
+def set_postgres_session_options(dbapi_conn, connection_record):
     """
-    Set PostgreSQL-specific optimizations on connection.
+    Set PostgreSQL session-level parameters on each new connection.
+    
+    - statement_timeout: a runaway query can't hold a pool slot forever
+    - lock_timeout: fail fast instead of queueing behind a long lock
+    - jit=off: LLVM compile time outweighs any gain on short OLTP queries
     
-    This can be used to set session-level parameters like:
-    - statement_timeout
-    - lock_timeout
-    - etc.
+    Runs once per pooled connection, not per query. Long-running work on
+    the shared engine (materialized view refresh, CSV COPY) lifts the
+    timeout for its own transaction with SET LOCAL statement_timeout = 0.
     """
-    # Example: Set statement timeout to 30 seconds
-    # cursor = dbapi_conn.cursor()
-    # cursor.execute("SET statement_timeout = 30000")
-    # cursor.close()
-    pass
+    cursor = dbapi_conn.cursor()
+    cursor.execute(
+        "SET statement_timeout = '30s'; "
+        "SET lock_timeout = '5s'; "
+        "SET jit = off"
+    )
+    cursor.close()
+    # Commit so the pool's rollback-on-return doesn't undo the SETs
+    dbapi_conn.commit()
 
 
 class DatabaseSession:
@@ -208,7 +283,7 @@ def check_db_connection() -> bool:
             db.execute(text("SELECT 1"))
         return True
     except Exception as e:
-        print(f"❌ Database connection failed: {e}")
+        logger.error("Database connection failed: %s", e)
         return False
 
 
@@ -9,23 +9,63 @@ and registers all route modules.
 
 from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.exceptions import RequestValidationError
+from starlette.concurrency import run_in_threadpool
 from sqlalchemy.exc import SQLAlchemyError
 from contextlib import asynccontextmanager
+import asyncio
 import time
+import uuid
 
 from app.config import settings
-from app.core.logging import get_logger, log_request, log_error
+from app.core.logging import get_logger, log_request, log_error, request_id_var
+from app.core.rate_limiter import rate_limiter, RateLimitMiddleware
+from app.core.responses import ORJSONResponse
 from app.database import check_db_connection, init_db
+from app.workers.queue import run_click_flusher, run_click_count_flusher
 
 # Initialize logger
 logger = get_logger(__name__)
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    """
+    Application startup and shutdown (single source of truth for ordering).
+    """
+    logger.info("=" * 60)
+    logger.info("Starting %s v%s", settings.app_name, settings.app_version)
+    logger.info("Environment: %s", settings.environment)
+    logger.info("Debug Mode: %s", settings.debug)
+    logger.info("=" * 60)
+    
+    # Check database connection
+    if check_db_connection():
+        logger.info("Database connection successful")
+    else:
+        logger.error("Database connection failed!")
+    
     init_db()
+    
+    # Evict idle rate limiter keys in the background
+    background_tasks = [asyncio.create_task(rate_limiter.run_sweeper())]
+    
+    # Drain Redis-buffered click events and counters into Postgres
+    if settings.click_buffer_enabled:
+        background_tasks.append(asyncio.create_task(run_click_flusher()))
+        background_tasks.append(asyncio.create_task(run_click_count_flusher()))
+    
+    logger.info("API running at http://%s:%s", settings.host, settings.port)
+    logger.info("Docs available at http://%s:%s/docs", settings.host, settings.port)
+    
     yield
+    
+    logger.info("Shutting down PingLayer...")
+    # Cancel, then wait for the tasks to unwind, so none is destroyed while
+    # still pending (a flush in the threadpool finishes its transaction)
+    for task in background_tasks:
+        task.cancel()
+    await asyncio.gather(*background_tasks, return_exceptions=True)
 
 
 # Create FastAPI app
@@ -36,6 +76,7 @@ app = FastAPI(
     docs_url="/docs" if settings.is_development else None,  # Disable docs in production
     redoc_url="/redoc" if settings.is_development else None,
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 
@@ -44,39 +85,64 @@ app = FastAPI(
 # ============================================================================
 
 # CORS Middleware
+# Explicit lists instead of "*" so preflight responses are fixed strings, and
+# max_age lets browsers cache the preflight for a day
 app.add_middleware(
     CORSMiddleware,
     allow_origins=settings.cors_origins,
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=["GET", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"],
+    allow_headers=["Authorization", "Content-Type", "X-Requested-With", "X-Request-ID"],
+    expose_headers=[
+        "X-Process-Time", "X-Request-ID",
+        "X-RateLimit-Limit", "X-RateLimit-Remaining", "X-RateLimit-Reset", "Retry-After",
+    ],
+    max_age=86400,
 )
 
+# Compress larger JSON bodies (campaign/recipient lists); small ones aren't
+# worth the CPU
+app.add_middleware(GZipMiddleware, minimum_size=1000)
+
+# Rate Limit Middleware (one Redis round-trip per request)
+if settings.rate_limit_enabled:
+    app.add_middleware(RateLimitMiddleware)
+
 
 # Request Logging Middleware
 @app.middleware("http")
 async def log_requests(request: Request, call_next):
     """
     Log all HTTP requests with timing information.
-    """
-    start_time = time.time()
-    
-    # Process request
-    response = await call_next(request)
     
-    # Calculate duration
-    duration_ms = (time.time() - start_time) * 1000
-    
-    # Log request
-    log_request(
-        method=request.method,
-        path=request.url.path,
-        status_code=response.status_code,
-        duration_ms=duration_ms
-    )
+    Also sets the request ID (from X-Request-ID or a new UUID) for the
+    duration of the request so every log record carries it.
+    """
+    request_id = request.headers.get("X-Request-ID") or uuid.uuid4().hex
+    token = request_id_var.set(request_id)
+    try:
+        # Monotonic integer clock - immune to wall-clock adjustments
+        start_ns = time.perf_counter_ns()
+        
+        # Process request
+        response = await call_next(request)
+        
+        # Calculate duration
+        duration_us = (time.perf_counter_ns() - start_ns) // 1000
+        
+        # Log request (scope["path"] avoids building a URL object)
+        log_request(
+            method=request.method,
+            path=request.scope["path"],
+            status_code=response.status_code,
+            duration_ms=duration_us / 1000
+        )
+    finally:
+        request_id_var.reset(token)
     
     # Add custom headers
-    response.headers["X-Process-Time"] = f"{duration_ms:.2f}ms"
+    response.headers["X-Process-Time"] = "%d.%02dms" % divmod(duration_us // 10, 100)
+    response.headers["X-Request-ID"] = request_id
     
     return response
 
@@ -90,17 +156,19 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
     """
     Handle Pydantic validation errors with user-friendly messages.
     """
-    errors = []
-    for error in exc.errors():
-        errors.append({
-            "field": " -> ".join(str(x) for x in error["loc"]),
+    errors = [
+        {
+            "field": " -> ".join(map(str, error["loc"])),
             "message": error["msg"],
             "type": error["type"]
-        })
+        }
+        for error in exc.errors()
+    ]
     
-    logger.warning(f"Validation error on {request.url.path}: {errors}")
+    logger.warning("Validation error on %s: %s", request.scope["path"], errors)
     
-    return JSONResponse(
+    # ORJSONResponse serializes the dict directly (no jsonable_encoder pass)
+    return ORJSONResponse(
         status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
         content={
             "detail": "Validation error",
@@ -116,7 +184,7 @@ async def database_exception_handler(request: Request, exc: SQLAlchemyError):
     """
     log_error(exc, context={"path": request.url.path})
     
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
         content={
             "detail": "Database error occurred. Please try again later."
@@ -137,7 +205,7 @@ async def general_exception_handler(request: Request, exc: Exception):
     else:
         detail = f"{type(exc).__name__}: {str(exc)}"
     
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
         content={"detail": detail}
     )
@@ -147,17 +215,21 @@ async def general_exception_handler(request: Request, exc: Exception):
 # ROUTES
 # ============================================================================
 
+# Static API info, built once at import
+_ROOT_INFO = {
+    "name": settings.app_name,
+    "version": settings.app_version,
+    "environment": settings.environment,
+    "status": "running"
+}
+
+
 @app.get("/", tags=["Root"])
 async def root():
     """
     Root endpoint - API information.
     """
-    return {
-        "name": settings.app_name,
-        "version": settings.app_version,
-        "environment": settings.environment,
-        "status": "running"
-    }
+    return _ROOT_INFO
 
 
 @app.get("/health", tags=["Health"])
@@ -170,7 +242,8 @@ async def health_check():
     - Database connection is healthy
     """
     logger.info("Checking health of API and database...")
-    db_healthy = check_db_connection()
+    # check_db_connection is blocking; keep it off the event loop
+    db_healthy = await run_in_threadpool(check_db_connection)
     
     return {
         "status": "healthy" if db_healthy else "unhealthy",
@@ -186,6 +259,7 @@ async def health_check():
 from app.modules.auth.router import router as auth_router
 from app.modules.campaigns.router import router as campaigns_router
 from app.modules.recipients.router import router as recipients_router
+from app.modules.smartlinks.router import redirect_router as smartlink_redirect_router
 # from app.modules.companies.router import router as companies_router
 # from app.modules.smartlinks.router import router as smartlinks_router
 # from app.modules.analytics.router import router as analytics_router
@@ -193,45 +267,12 @@ from app.modules.recipients.router import router as recipients_router
 app.include_router(auth_router, prefix="/api/auth", tags=["Authentication"])
 app.include_router(campaigns_router, prefix="/api/campaigns", tags=["Campaigns"])
 app.include_router(recipients_router, prefix="/api", tags=["Recipients"])
+app.include_router(smartlink_redirect_router, prefix="/s", tags=["Smart Links"])
 # app.include_router(companies_router, prefix="/api/companies", tags=["Companies"])
 # app.include_router(smartlinks_router, prefix="/api/smartlinks", tags=["Smart Links"])
 # app.include_router(analytics_router, prefix="/api/analytics", tags=["Analytics"])
 
 
-# ============================================================================
-# STARTUP & SHUTDOWN EVENTS
-# ============================================================================
-
-@app.on_event("startup")
-async def startup_event():
-    """
-    Run on application startup.
-    """
-    logger.info("=" * 60)
-    logger.info(f"🚀 Starting {settings.app_name} v{settings.app_version}")
-    logger.info(f"📍 Environment: {settings.environment}")
-    logger.info(f"🔧 Debug Mode: {settings.debug}")
-    logger.info("=" * 60)
-    
-    # Check database connection
-    if check_db_connection():
-        logger.info("✅ Database connection successful")
-    else:
-        logger.error("❌ Database connection failed!")
-    
-    logger.info(f"📡 API running at http://{settings.host}:{settings.port}")
-    logger.info(f"📚 Docs available at http://{settings.host}:{settings.port}/docs")
-
-
-@app.on_event("shutdown")
-async def shutdown_event():
-    """
-    Run on application shutdown.
-    """
-    logger.info("👋 Shutting down PingLayer...")
-
-
-
 # ============================================================================
 # MAIN
 # ============================================================================
@@ -13,7 +13,9 @@ from app.models.campaign import Campaign, CampaignStatus
 from app.models.recipient import Recipient
 from app.models.message_log import MessageLog, MessageStatus
 from app.models.smart_link import SmartLink
+from app.models.smart_link_unique_ip import SmartLinkUniqueIp
 from app.models.click_event import ClickEvent
+from app.models.user_agent_signature import UserAgentSignature
 from app.models.integration import Integration, IntegrationType, IntegrationStatus
 
 __all__ = [
@@ -24,7 +26,9 @@ __all__ = [
     "Recipient",
     "MessageLog",
     "SmartLink",
+    "SmartLinkUniqueIp",
     "ClickEvent",
+    "UserAgentSignature",
     "Integration",
     # Enums
     "CampaignStatus",
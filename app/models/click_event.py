@@ -5,19 +5,27 @@ Tracks individual clicks on smart links with analytics data.
 
 Design Decisions:
 - One event per click
-- IP-based unique visitor tracking
-- User agent parsing for device/browser info
+- IP-based unique visitor tracking on a 64-bit hash of the IP
+  (app.utils.ip.ip_hash); the raw address is never stored
+- User agent parsed once per distinct UA string and referenced by id
+  (see UserAgentSignature), not stored/parsed per click
 - GeoIP for location tracking
 - Referrer tracking
+- Bulk ingestion via Core executemany INSERTs (see ClickEvent.bulk_record)
+- BIGINT id: high-traffic links can pass 2^31 clicks
+- Range-partitioned by month on clicked_at (see create_monthly_partitions);
+  the primary key is (id, clicked_at) because Postgres requires the
+  partition key in every unique constraint
 
 Relationships:
 - Many-to-One with SmartLink
+- Many-to-One with UserAgentSignature
 """
 
-from datetime import datetime
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Index
-from sqlalchemy.orm import relationship
-from app.database import Base
+from typing import Any, Dict, List, Optional
+from sqlalchemy import Column, Integer, BigInteger, String, DateTime, ForeignKey, Index, insert
+from sqlalchemy.orm import relationship, Session
+from app.database import Base, utc_now
 
 
 class ClickEvent(Base):
@@ -27,13 +35,10 @@ class ClickEvent(Base):
     Each click on a smart link creates one event with analytics data.
     
     Attributes:
-        id: Primary key
+        id: Primary key (with clicked_at)
         smart_link_id: Foreign key to SmartLink
-        ip_address: Visitor IP address (for unique tracking)
-        user_agent: Browser user agent string
-        device_type: Device type (mobile, desktop, tablet)
-        browser: Browser name
-        os: Operating system
+        ip_hash: Signed 64-bit hash of the visitor IP (for unique tracking)
+        ua_signature_id: Foreign key to the parsed UserAgentSignature
         country: Country code (from GeoIP)
         city: City name (from GeoIP)
         referrer: HTTP referrer
@@ -42,20 +47,19 @@ class ClickEvent(Base):
     
     __tablename__ = "click_events"
     
-    # Primary Key
-    id = Column(Integer, primary_key=True, index=True)
+    # Primary Key (id, clicked_at)
+    id = Column(BigInteger, primary_key=True, autoincrement=True, index=True)
     
     # Smart link relationship
     smart_link_id = Column(Integer, ForeignKey("smart_links.id", ondelete="CASCADE"), nullable=False, index=True)
     
     # Visitor Info
-    ip_address = Column(String(45), nullable=True, index=True)  # IPv6 max length
-    user_agent = Column(String(500), nullable=True)
+    ip_hash = Column(BigInteger, nullable=True, index=True)
     
-    # Device Info (parsed from user agent)
-    device_type = Column(String(50), nullable=True)  # mobile, desktop, tablet
-    browser = Column(String(100), nullable=True)
-    os = Column(String(100), nullable=True)
+    # Device Info (interned; see app.utils.user_agent.get_ua_signature_id)
+    ua_signature_id = Column(
+        Integer, ForeignKey("user_agent_signatures.id", ondelete="SET NULL"), nullable=True, index=True
+    )
     
     # Location Info (from GeoIP)
     country = Column(String(2), nullable=True)  # ISO country code
@@ -65,20 +69,67 @@ class ClickEvent(Base):
     referrer = Column(String(500), nullable=True)
     
     # Timestamp
-    clicked_at = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
+    clicked_at = Column(DateTime, server_default=utc_now, primary_key=True)  # Partition key
     
     # Relationships
     smart_link = relationship("SmartLink", back_populates="click_events")
+    ua_signature = relationship("UserAgentSignature", back_populates="click_events")
     
     # Indexes for analytics queries
     __table_args__ = (
         Index("ix_click_events_link_clicked", "smart_link_id", "clicked_at"),
         Index("ix_click_events_country", "country"),
-        Index("ix_click_events_device", "device_type"),
+        # BRIN: a few pages for an append-only timestamp column
+        Index("ix_click_events_clicked_at", "clicked_at", postgresql_using="brin"),
+        {"postgresql_partition_by": "RANGE (clicked_at)"},
     )
     
     def __repr__(self):
-        return f"<ClickEvent id={self.id} link_id={self.smart_link_id} ip={self.ip_address}>"
+        return f"<ClickEvent id={self.id} link_id={self.smart_link_id} ip_hash={self.ip_hash}>"
+    
+    @classmethod
+    def bulk_record(
+        cls,
+        db: Session,
+        events: List[Dict[str, Any]],
+        batch_size: int = 500,
+        return_ids: bool = False
+    ) -> List[int]:
+        """
+        Insert many click events with one multi-row INSERT per batch.
+        
+        Bypasses the ORM unit of work (no per-row add()/flush). All batches
+        run in the caller's transaction; the caller commits.
+        
+        Without return_ids the INSERT has no RETURNING clause, so the
+        driver can use its plain executemany fast path.
+        
+        Args:
+            db: Database session
+            events: Column dicts, e.g. {"smart_link_id": 1, "ua_signature_id": 3, ...}
+            batch_size: Rows per INSERT statement
+            return_ids: Whether to return the new row ids
+        
+        Returns:
+            IDs of the inserted rows in input order (empty unless return_ids)
+        """
+        stmt = insert(cls)
+        if return_ids:
+            stmt = stmt.returning(cls.id, sort_by_parameter_order=True)
+        
+        ids: List[int] = []
+        for start in range(0, len(events), batch_size):
+            chunk = events[start:start + batch_size]
+            if return_ids:
+                ids.extend(db.scalars(stmt, chunk))
+            else:
+                db.execute(stmt, chunk)
+        return ids
+    
+    @property
+    def device_type(self) -> Optional[str]:
+        """Device type from the linked user agent signature"""
+        return self.ua_signature.device_type if self.ua_signature else None
     
     @property
     def is_mobile(self) -> bool:
@@ -90,18 +141,8 @@ class ClickEvent(Base):
         """Check if click was from desktop"""
         return self.device_type == "desktop"
     
-    def to_dict(self):
-        """Convert to dictionary"""
-        return {
-            "id": self.id,
-            "smart_link_id": self.smart_link_id,
-            "ip_address": self.ip_address,
-            "user_agent": self.user_agent,
-            "device_type": self.device_type,
-            "browser": self.browser,
-            "os": self.os,
-            "country": self.country,
-            "city": self.city,
-            "referrer": self.referrer,
-            "clicked_at": self.clicked_at.isoformat() if self.clicked_at else None,
-        }
+    # Serialized by app.core.responses.ORJSONResponse
+    _json_fields = (
+        "id", "smart_link_id", "ip_hash", "ua_signature_id", "country", "city",
+        "referrer", "clicked_at",
+    )
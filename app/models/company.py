@@ -15,10 +15,9 @@ Relationships:
 - One-to-Many with Integration
 """
 
-from datetime import datetime
 from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text
 from sqlalchemy.orm import relationship
-from app.database import Base
+from app.database import Base, utc_now
 
 
 class Company(Base):
@@ -59,8 +58,8 @@ class Company(Base):
     plan = Column(String(50), default="free", nullable=False)  # free, pro, enterprise
     
     # Timestamps
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+    created_at = Column(DateTime, server_default=utc_now, nullable=False)
+    updated_at = Column(DateTime, server_default=utc_now, onupdate=utc_now, nullable=False)
     
     # Relationships
     users = relationship("User", back_populates="company", cascade="all, delete-orphan")
@@ -80,17 +79,8 @@ class Company(Base):
         """Get number of campaigns for this company"""
         return len(self.campaigns) if self.campaigns else 0
     
-    def to_dict(self):
-        """Convert to dictionary"""
-        return {
-            "id": self.id,
-            "name": self.name,
-            "slug": self.slug,
-            "description": self.description,
-            "email": self.email,
-            "phone": self.phone,
-            "is_active": self.is_active,
-            "plan": self.plan,
-            "created_at": self.created_at.isoformat() if self.created_at else None,
-            "updated_at": self.updated_at.isoformat() if self.updated_at else None,
-        }
+    # Serialized by app.core.responses.ORJSONResponse
+    _json_fields = (
+        "id", "name", "slug", "description", "email", "phone", "is_active", "plan",
+        "created_at", "updated_at",
+    )
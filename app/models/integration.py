@@ -13,11 +13,11 @@ Relationships:
 - Many-to-One with Company
 """
 
-from datetime import datetime
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Boolean, Enum as SQLEnum, JSON
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Boolean, Enum as SQLEnum
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
 import enum
-from app.database import Base
+from app.database import Base, utc_now
 
 
 class IntegrationType(str, enum.Enum):
@@ -92,15 +92,15 @@ class Integration(Base):
     business_account_id = Column(String(255), nullable=True)
     
     # Additional configuration
-    config = Column(JSON, nullable=True)
+    config = Column(JSONB, nullable=True)
     
     # Sync tracking
     last_sync_at = Column(DateTime, nullable=True)
     error_message = Column(Text, nullable=True)
     
     # Timestamps
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+    created_at = Column(DateTime, server_default=utc_now, nullable=False)
+    updated_at = Column(DateTime, server_default=utc_now, onupdate=utc_now, nullable=False)
     
     # Relationships
     company = relationship("Company", back_populates="integrations")
@@ -118,30 +118,9 @@ class Integration(Base):
         """Check if this is a WhatsApp integration"""
         return self.type == IntegrationType.WHATSAPP
     
-    def to_dict(self, include_secrets: bool = False):
-        """
-        Convert to dictionary.
-        
-        Args:
-            include_secrets: Whether to include API credentials (default: False)
-        """
-        data = {
-            "id": self.id,
-            "company_id": self.company_id,
-            "type": self.type.value if self.type else None,
-            "status": self.status.value if self.status else None,
-            "name": self.name,
-            "phone_number_id": self.phone_number_id,
-            "business_account_id": self.business_account_id,
-            "last_sync_at": self.last_sync_at.isoformat() if self.last_sync_at else None,
-            "error_message": self.error_message,
-            "created_at": self.created_at.isoformat() if self.created_at else None,
-            "updated_at": self.updated_at.isoformat() if self.updated_at else None,
-        }
-        
-        if include_secrets:
-            data["api_key"] = self.api_key
-            data["api_secret"] = self.api_secret
-            data["config"] = self.config
-        
-        return data
+    # Serialized by app.core.responses.ORJSONResponse (API credentials excluded)
+    _json_fields = (
+        "id", "company_id", "type", "status", "name", "phone_number_id",
+        "business_account_id", "last_sync_at", "error_message", "created_at",
+        "updated_at",
+    )
@@ -9,17 +9,26 @@ Design Decisions:
 - WhatsApp message ID tracking
 - Error logging
 - Delivery timestamp tracking
+- Per-campaign status counts are served from a materialized view
+  (mv_campaign_status_counts) instead of a GROUP BY over every log row
+- Range-partitioned by month on created_at (see create_monthly_partitions);
+  the primary key is (id, created_at) because Postgres requires the
+  partition key in every unique constraint
+- BIGINT id: one row per message per recipient outgrows int32
 
 Relationships:
 - Many-to-One with Campaign
 - Many-to-One with Recipient
 """
 
-from datetime import datetime
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Enum as SQLEnum, Index
+from sqlalchemy import (
+    Column, Integer, BigInteger, String, Text, DateTime, ForeignKey, Enum as SQLEnum, Index,
+    MetaData, Table, text
+)
+from sqlalchemy.engine import Connection
 from sqlalchemy.orm import relationship
 import enum
-from app.database import Base
+from app.database import Base, utc_now
 
 
 class MessageStatus(str, enum.Enum):
@@ -38,7 +47,7 @@ class MessageLog(Base):
     Each log entry represents one message sent to one recipient.
     
     Attributes:
-        id: Primary key
+        id: Primary key (with created_at)
         campaign_id: Foreign key to Campaign
         recipient_id: Foreign key to Recipient
         phone_number: Recipient phone number (denormalized for quick access)
@@ -55,8 +64,8 @@ class MessageLog(Base):
     
     __tablename__ = "message_logs"
     
-    # Primary Key
-    id = Column(Integer, primary_key=True, index=True)
+    # Primary Key (id, created_at)
+    id = Column(BigInteger, primary_key=True, autoincrement=True, index=True)
     
     # Relationships
     campaign_id = Column(Integer, ForeignKey("campaigns.id", ondelete="CASCADE"), nullable=False, index=True)
@@ -84,8 +93,8 @@ class MessageLog(Base):
     sent_at = Column(DateTime, nullable=True)
     delivered_at = Column(DateTime, nullable=True)
     read_at = Column(DateTime, nullable=True)
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+    created_at = Column(DateTime, server_default=utc_now, primary_key=True)  # Partition key
+    updated_at = Column(DateTime, server_default=utc_now, onupdate=utc_now, nullable=False)
     
     # Relationships
     campaign = relationship("Campaign", back_populates="message_logs")
@@ -94,7 +103,9 @@ class MessageLog(Base):
     # Indexes for common queries
     __table_args__ = (
         Index("ix_message_logs_campaign_status", "campaign_id", "status"),
-        Index("ix_message_logs_created_at", "created_at"),
+        # BRIN: a few pages for an append-only timestamp column
+        Index("ix_message_logs_created_at", "created_at", postgresql_using="brin"),
+        {"postgresql_partition_by": "RANGE (created_at)"},
     )
     
     def __repr__(self):
@@ -118,20 +129,54 @@ class MessageLog(Base):
             return delta.total_seconds()
         return 0.0
     
-    def to_dict(self):
-        """Convert to dictionary"""
-        return {
-            "id": self.id,
-            "campaign_id": self.campaign_id,
-            "recipient_id": self.recipient_id,
-            "phone_number": self.phone_number,
-            "status": self.status.value if self.status else None,
-            "message_content": self.message_content,
-            "whatsapp_message_id": self.whatsapp_message_id,
-            "error_message": self.error_message,
-            "sent_at": self.sent_at.isoformat() if self.sent_at else None,
-            "delivered_at": self.delivered_at.isoformat() if self.delivered_at else None,
-            "read_at": self.read_at.isoformat() if self.read_at else None,
-            "created_at": self.created_at.isoformat() if self.created_at else None,
-            "updated_at": self.updated_at.isoformat() if self.updated_at else None,
-        }
+    # Serialized by app.core.responses.ORJSONResponse
+    _json_fields = (
+        "id", "campaign_id", "recipient_id", "phone_number", "status",
+        "message_content", "whatsapp_message_id", "error_message", "sent_at",
+        "delivered_at", "read_at", "created_at", "updated_at",
+    )
+
+
+
+# ============================================================================
+# CAMPAIGN STATUS COUNTS (materialized view)
+# ============================================================================
+
+# Own MetaData so create_all() never tries to create the view as a table
+_view_metadata = MetaData()
+
+campaign_status_counts = Table(
+    "mv_campaign_status_counts",
+    _view_metadata,
+    Column("campaign_id", Integer, primary_key=True),
+    Column("status", SQLEnum(MessageStatus, name="message_status_enum", create_type=False), primary_key=True),
+    Column("n", BigInteger, nullable=False),
+    Column("last_seen", DateTime, nullable=True),
+)
+
+# The unique index is what allows REFRESH ... CONCURRENTLY (readers are
+# never blocked by a refresh)
+CAMPAIGN_STATUS_COUNTS_DDL = (
+    "CREATE MATERIALIZED VIEW IF NOT EXISTS mv_campaign_status_counts AS "
+    "SELECT campaign_id, status, count(*) AS n, max(updated_at) AS last_seen "
+    "FROM message_logs GROUP BY campaign_id, status",
+    "CREATE UNIQUE INDEX IF NOT EXISTS uq_mv_campaign_status_counts "
+    "ON mv_campaign_status_counts (campaign_id, status)",
+)
+
+
+def create_campaign_status_counts_view(conn: Connection) -> None:
+    """Create the status counts view and its unique index if missing"""
+    for statement in CAMPAIGN_STATUS_COUNTS_DDL:
+        conn.execute(text(statement))
+
+
+def refresh_campaign_status_counts(conn: Connection) -> None:
+    """
+    Recompute the status counts view without blocking readers.
+    
+    Must run inside a transaction: the refresh scans all of message_logs,
+    so the pool-wide statement_timeout is lifted for this transaction only.
+    """
+    conn.execute(text("SET LOCAL statement_timeout = 0"))
+    conn.execute(text("REFRESH MATERIALIZED VIEW CONCURRENTLY mv_campaign_status_counts"))
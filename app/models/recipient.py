@@ -6,7 +6,10 @@ Represents a recipient in a campaign.
 Design Decisions:
 - Recipients are tied to a specific campaign
 - Phone number validation
-- Custom data per recipient (for template variables)
+- Phone numbers are normalized to E.164 once, when assigned, so readers
+  (e.g. the send loop) use phone_number as-is
+- Custom data per recipient (for template variables), stored as JSONB
+  with a GIN index so key lookups don't re-parse text
 - Status tracking per recipient
 
 Relationships:
@@ -14,10 +17,27 @@ Relationships:
 - One-to-Many with MessageLog
 """
 
-from datetime import datetime
-from sqlalchemy import Column, Integer, String, ForeignKey, JSON, DateTime, UniqueConstraint
-from sqlalchemy.orm import relationship
-from app.database import Base
+import re
+
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Index, UniqueConstraint
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import relationship, validates
+from app.database import Base, utc_now
+
+# Separators stripped from phone numbers before storing (whitespace, dashes,
+# parentheses); shared with the RecipientCreate schema so the JSON and CSV
+# paths normalize identically
+PHONE_SEPARATORS = str.maketrans("", "", " \t\n\r\f\v-()")
+# Accepted phone number shape after normalization: + and 10-15 digits
+E164_RE = re.compile(r"^\+\d{10,15}$")
+
+
+def to_e164(phone_number: str) -> str:
+    """Strip separators and ensure a leading + (E.164 form)"""
+    phone_number = phone_number.translate(PHONE_SEPARATORS)
+    if not phone_number.startswith("+"):
+        phone_number = f"+{phone_number}"
+    return phone_number
 
 
 class Recipient(Base):
@@ -31,7 +51,7 @@ class Recipient(Base):
         campaign_id: Foreign key to Campaign
         phone_number: WhatsApp phone number (E.164 format)
         name: Recipient name (optional)
-        custom_data: JSON field for template variables (e.g., {name: "John", company: "Acme"})
+        custom_data: JSONB field for template variables (e.g., {name: "John", company: "Acme"})
         created_at: Timestamp of creation
     """
     
@@ -41,19 +61,21 @@ class Recipient(Base):
     id = Column(Integer, primary_key=True, index=True)
     
     # Campaign relationship
-    campaign_id = Column(Integer, ForeignKey("campaigns.id", ondelete="CASCADE"), nullable=False, index=True)
+    # Indexed as the leading column of uq_recipient_campaign_phone and
+    # ix_recipients_campaign_id_id
+    campaign_id = Column(Integer, ForeignKey("campaigns.id", ondelete="CASCADE"), nullable=False)
     
     # Recipient Info
-    phone_number = Column(String(20), nullable=False, index=True)  # E.164 format: +1234567890
+    phone_number = Column(String(20), nullable=False)  # E.164 format: +1234567890
     name = Column(String(255), nullable=True)
     email = Column(String(255), nullable=True)
     
     # Custom data for template variables
     # Example: {"first_name": "John", "company": "Acme Corp", "discount": "20%"}
-    custom_data = Column(JSON, nullable=True)
+    custom_data = Column(JSONB, nullable=True)
     
     # Timestamps
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    created_at = Column(DateTime, server_default=utc_now, nullable=False)
     
     # Relationships
     campaign = relationship("Campaign", back_populates="recipients")
@@ -63,27 +85,27 @@ class Recipient(Base):
     __table_args__ = (
         # Prevent duplicate phone numbers in same campaign
         UniqueConstraint("campaign_id", "phone_number", name="uq_recipient_campaign_phone"),
+        # Keyset pagination: WHERE campaign_id = ? AND id > ? ORDER BY id
+        Index("ix_recipients_campaign_id_id", "campaign_id", "id"),
+        # Containment lookups (custom_data @> '{"company": "Acme"}')
+        Index(
+            "ix_recipients_custom_data", "custom_data",
+            postgresql_using="gin", postgresql_ops={"custom_data": "jsonb_path_ops"}
+        ),
     )
     
     def __repr__(self):
         return f"<Recipient id={self.id} phone={self.phone_number} campaign_id={self.campaign_id}>"
     
-    @property
-    def formatted_phone(self) -> str:
-        """Get formatted phone number for display"""
-        # Simple formatting - can be enhanced
-        if self.phone_number.startswith("+"):
-            return self.phone_number
-        return f"+{self.phone_number}"
+    @validates("phone_number")
+    def normalize_phone_number(self, key, value):
+        """Store phone numbers in E.164 form (no separators, leading +)"""
+        if value is None:
+            return value
+        return to_e164(value)
     
-    def to_dict(self):
-        """Convert to dictionary"""
-        return {
-            "id": self.id,
-            "campaign_id": self.campaign_id,
-            "phone_number": self.phone_number,
-            "name": self.name,
-            "email": self.email,
-            "custom_data": self.custom_data,
-            "created_at": self.created_at.isoformat() if self.created_at else None,
-        }
+    # Serialized by app.core.responses.ORJSONResponse
+    _json_fields = (
+        "id", "campaign_id", "phone_number", "name", "email", "custom_data",
+        "created_at",
+    )
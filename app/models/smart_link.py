@@ -5,25 +5,78 @@ Represents a trackable smart link embedded in campaign messages.
 
 Design Decisions:
 - Short URL generation for WhatsApp messages
+- Short codes are the primary key run through a keyed permutation
+  (collision-free, no unique-index retry per link, and not enumerable
+  without the server's secret key)
 - Click tracking with analytics
+- Unique clicks are exact when counted via record_click (one statement,
+  backed by smart_link_unique_ips), or estimated by the Redis counters
 - Multiple links per campaign support
 - Expiration support (optional)
 
 Relationships:
 - Many-to-One with Campaign
 - One-to-Many with ClickEvent
+- One-to-Many with SmartLinkUniqueIp
 """
 
+import hashlib
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Boolean, Index
-from sqlalchemy.orm import relationship
-import secrets
-from app.database import Base
+from typing import List, Optional
+from sqlalchemy import (
+    Column, Integer, String, Text, DateTime, ForeignKey, Boolean, Index, event, text,
+    func, literal_column, select, update
+)
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import relationship, Session
+from app.config import settings
+from app.database import Base, utc_now
+from app.models.smart_link_unique_ip import SmartLinkUniqueIp
+from app.utils.ip import ip_hash
 
+# Resolved once; short_url is built for every link in list responses
+_SMART_LINK_BASE_URL = settings.smart_link_base_url
 
-def generate_short_code(length: int = 8) -> str:
-    """Generate a random short code for smart links"""
-    return secrets.token_urlsafe(length)[:length]
+# Short code encoding: id -> keyed Feistel permutation of 40 bits -> 7
+# base62 chars. A Feistel network is a bijection whatever its round
+# function, so codes stay unique per id; the round function is BLAKE2b
+# keyed with a key derived from settings.secret_key, so the id <-> code
+# mapping can't be computed (or walked) without the secret. Codes are
+# stored, so rotating secret_key only changes codes of new links.
+_SHORT_CODE_ALPHABET = "k3XqT9mZbLw2RfN8vYcJ0pHs5GdQx1MtB7nWgV6rKe4ClFyPjDuSahIzAEioOU"
+_SHORT_CODE_BITS = 40
+_SHORT_CODE_HALF_BITS = _SHORT_CODE_BITS // 2
+_SHORT_CODE_HALF_MASK = (1 << _SHORT_CODE_HALF_BITS) - 1
+_SHORT_CODE_ROUNDS = 8
+_SHORT_CODE_LENGTH = 7  # 62**7 > 2**40
+_SHORT_CODE_KEY = hashlib.blake2b(
+    settings.secret_key_bytes, digest_size=32, person=b"smartlink-code"
+).digest()
+
+
+def _short_code_round(round_index: int, half: int) -> int:
+    """Feistel round function: keyed BLAKE2b of (round, half), 20 bits"""
+    digest = hashlib.blake2b(
+        bytes((round_index,)) + half.to_bytes(3, "big"), digest_size=4, key=_SHORT_CODE_KEY
+    ).digest()
+    return int.from_bytes(digest, "big") & _SHORT_CODE_HALF_MASK
+
+
+def generate_short_code(link_id: int) -> str:
+    """Encode a smart link id as its short code (deterministic, unique per id)"""
+    if not 0 < link_id < (1 << _SHORT_CODE_BITS):
+        raise ValueError(f"Smart link id out of short code range: {link_id}")
+    
+    left, right = link_id >> _SHORT_CODE_HALF_BITS, link_id & _SHORT_CODE_HALF_MASK
+    for round_index in range(_SHORT_CODE_ROUNDS):
+        left, right = right, left ^ _short_code_round(round_index, right)
+    
+    n = (left << _SHORT_CODE_HALF_BITS) | right
+    chars = []
+    for _ in range(_SHORT_CODE_LENGTH):
+        n, r = divmod(n, 62)
+        chars.append(_SHORT_CODE_ALPHABET[r])
+    return "".join(chars)
 
 
 class SmartLink(Base):
@@ -56,7 +109,8 @@ class SmartLink(Base):
     campaign_id = Column(Integer, ForeignKey("campaigns.id", ondelete="CASCADE"), nullable=False, index=True)
     
     # Short URL
-    short_code = Column(String(50), unique=True, nullable=False, index=True, default=generate_short_code)
+    # Filled from the id before insert (see _assign_short_code)
+    short_code = Column(String(50), unique=True, nullable=False, index=True)
     
     # Destination
     destination_url = Column(Text, nullable=False)
@@ -71,8 +125,8 @@ class SmartLink(Base):
     unique_click_count = Column(Integer, default=0, nullable=False)
     
     # Timestamps
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+    created_at = Column(DateTime, server_default=utc_now, nullable=False)
+    updated_at = Column(DateTime, server_default=utc_now, onupdate=utc_now, nullable=False)
     
     # Relationships
     campaign = relationship("Campaign")
@@ -80,7 +134,9 @@ class SmartLink(Base):
     
     # Indexes
     __table_args__ = (
-        Index("ix_smart_links_campaign_active", "campaign_id", "is_active"),
+        # Partial: lookups only ever want active links, and inactive rows
+        # are covered by ix_smart_links_campaign_id
+        Index("ix_smart_links_campaign_active", "campaign_id", postgresql_where=text("is_active")),
     )
     
     def __repr__(self):
@@ -101,8 +157,7 @@ class SmartLink(Base):
     @property
     def short_url(self) -> str:
         """Get full short URL"""
-        from app.config import settings
-        return f"{settings.smart_link_base_url}/{self.short_code}"
+        return f"{_SMART_LINK_BASE_URL}/{self.short_code}"
     
     @property
     def click_through_rate(self) -> float:
@@ -111,20 +166,72 @@ class SmartLink(Base):
             return 0.0
         return (self.click_count / self.campaign.total_recipients) * 100
     
-    def to_dict(self):
-        """Convert to dictionary"""
-        return {
-            "id": self.id,
-            "campaign_id": self.campaign_id,
-            "short_code": self.short_code,
-            "short_url": self.short_url,
-            "destination_url": self.destination_url,
-            "title": self.title,
-            "is_active": self.is_active,
-            "is_expired": self.is_expired,
-            "expires_at": self.expires_at.isoformat() if self.expires_at else None,
-            "click_count": self.click_count,
-            "unique_click_count": self.unique_click_count,
-            "created_at": self.created_at.isoformat() if self.created_at else None,
-            "updated_at": self.updated_at.isoformat() if self.updated_at else None,
-        }
+    @staticmethod
+    def allocate_ids(db: Session, count: int) -> List[int]:
+        """
+        Reserve count ids from the smart_links sequence in one round-trip.
+        
+        For bulk creation: set link.id from these before db.add_all() and
+        the before_insert hook derives short codes without per-row nextval.
+        """
+        return list(db.scalars(
+            text("SELECT nextval('smart_links_id_seq') FROM generate_series(1, :n)"),
+            {"n": count}
+        ))
+    
+    @classmethod
+    def record_click(cls, db: Session, link_id: int, ip_address: Optional[str]) -> None:
+        """
+        Count one click, and one unique click if this IP is new for the link.
+        
+        A single statement: the CTE inserts (link_id, ip_hash) with ON
+        CONFLICT DO NOTHING, and the UPDATE adds however many rows it
+        returned (0 or 1) to unique_click_count. No read-before-write and
+        no race between concurrent clicks. The caller commits.
+        
+        Args:
+            db: Database session
+            link_id: Clicked SmartLink id
+            ip_address: Visitor IP (None counts the click as non-unique)
+        """
+        links = cls.__table__
+        stmt = update(links).where(links.c.id == link_id)
+        
+        if ip_address is None:
+            db.execute(stmt.values(click_count=links.c.click_count + 1))
+            return
+        
+        inserted = (
+            insert(SmartLinkUniqueIp)
+            .values(smart_link_id=link_id, ip_hash=ip_hash(ip_address))
+            .on_conflict_do_nothing()
+            .returning(literal_column("1"))
+            .cte("inserted")
+        )
+        db.execute(stmt.values(
+            click_count=links.c.click_count + 1,
+            unique_click_count=links.c.unique_click_count
+            + select(func.count()).select_from(inserted).scalar_subquery(),
+        ))
+    
+    # Serialized by app.core.responses.ORJSONResponse
+    _json_fields = (
+        "id", "campaign_id", "short_code", "short_url", "destination_url", "title",
+        "is_active", "is_expired", "expires_at", "click_count", "unique_click_count",
+        "created_at", "updated_at",
+    )
+
+
+
+@event.listens_for(SmartLink, "before_insert")
+def _assign_short_code(mapper, connection, target):
+    """
+    Reserve the id from the sequence up front so the short code can be
+    written in the same INSERT. Bulk creators can avoid the per-row
+    nextval by pre-assigning ids from SmartLink.allocate_ids().
+    """
+    if target.short_code:
+        return
+    if target.id is None:
+        target.id = connection.scalar(text("SELECT nextval('smart_links_id_seq')"))
+    target.short_code = generate_short_code(target.id)
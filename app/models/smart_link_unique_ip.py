@@ -0,0 +1,40 @@
+"""
+Smart Link Unique IP Model
+
+One row per (smart link, visitor IP) seen, used to count unique clicks.
+
+Design Decisions:
+- Exact, Redis-free alternative to the HyperLogLog counters in
+  app.workers.queue (see SmartLink.record_click)
+- Stores a 64-bit hash of the IP (8 bytes) instead of the address
+- The composite primary key is the uniqueness check: INSERT ... ON
+  CONFLICT DO NOTHING tells us whether the visitor is new without a
+  prior SELECT, and without racing concurrent clicks
+
+Relationships:
+- Many-to-One with SmartLink
+"""
+
+from sqlalchemy import Column, Integer, BigInteger, ForeignKey
+from app.database import Base
+
+
+class SmartLinkUniqueIp(Base):
+    """
+    Visitor IP hash recorded the first time it clicks a smart link.
+    
+    Attributes:
+        smart_link_id: Foreign key to SmartLink
+        ip_hash: Signed 64-bit hash of the visitor IP
+    """
+    
+    __tablename__ = "smart_link_unique_ips"
+    
+    # Primary Key (smart_link_id, ip_hash)
+    smart_link_id = Column(
+        Integer, ForeignKey("smart_links.id", ondelete="CASCADE"), primary_key=True
+    )
+    ip_hash = Column(BigInteger, primary_key=True)
+    
+    def __repr__(self):
+        return f"<SmartLinkUniqueIp link_id={self.smart_link_id} ip_hash={self.ip_hash}>"
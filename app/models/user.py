@@ -6,6 +6,8 @@ Represents a user in the system.
 Design Decisions:
 - Users belong to a company (multi-tenant)
 - Email is unique per company (not globally unique)
+- Email is CITEXT: compared case-insensitively, so the unique constraint
+  also serves login lookups without a lower() index
 - Password is hashed using bcrypt
 - Soft delete support via is_active flag
 - Role-based access (is_admin flag)
@@ -15,10 +17,10 @@ Relationships:
 - One-to-Many with Campaign (user creates campaigns)
 """
 
-from datetime import datetime
 from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, UniqueConstraint
+from sqlalchemy.dialects.postgresql import CITEXT
 from sqlalchemy.orm import relationship
-from app.database import Base
+from app.database import Base, utc_now
 
 
 class User(Base):
@@ -27,7 +29,7 @@ class User(Base):
     
     Attributes:
         id: Primary key
-        email: User's email (unique per company)
+        email: User's email (unique per company, case-insensitive)
         hashed_password: Bcrypt hashed password
         full_name: User's full name
         company_id: Foreign key to Company
@@ -43,7 +45,7 @@ class User(Base):
     id = Column(Integer, primary_key=True, index=True)
     
     # Authentication
-    email = Column(String(255), nullable=False, index=True)
+    email = Column(CITEXT, nullable=False, index=True)
     hashed_password = Column(String(255), nullable=False)
     
     # Profile
@@ -57,8 +59,8 @@ class User(Base):
     is_admin = Column(Boolean, default=False, nullable=False)
     
     # Timestamps
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+    created_at = Column(DateTime, server_default=utc_now, nullable=False)
+    updated_at = Column(DateTime, server_default=utc_now, onupdate=utc_now, nullable=False)
     
     # Relationships
     company = relationship("Company", back_populates="users")
@@ -78,15 +80,8 @@ class User(Base):
         """Check if user is authenticated (active)"""
         return self.is_active
     
-    def to_dict(self):
-        """Convert to dictionary (exclude password)"""
-        return {
-            "id": self.id,
-            "email": self.email,
-            "full_name": self.full_name,
-            "company_id": self.company_id,
-            "is_active": self.is_active,
-            "is_admin": self.is_admin,
-            "created_at": self.created_at.isoformat() if self.created_at else None,
-            "updated_at": self.updated_at.isoformat() if self.updated_at else None,
-        }
+    # Serialized by app.core.responses.ORJSONResponse (password excluded)
+    _json_fields = (
+        "id", "email", "full_name", "company_id", "is_active", "is_admin", "created_at",
+        "updated_at",
+    )
@@ -0,0 +1,61 @@
+"""
+User Agent Signature Model
+
+Interned, pre-parsed user agent strings referenced by click events.
+
+Design Decisions:
+- Only a few hundred distinct UA strings show up in practice, so each is
+  parsed once and stored here instead of on every ClickEvent row
+- Looked up by a 64-bit hash of the raw UA string (ua_hash, unique)
+- ClickEvent stores just ua_signature_id; analytics join this small table
+
+Relationships:
+- One-to-Many with ClickEvent
+"""
+
+from sqlalchemy import Column, Integer, BigInteger, String, DateTime
+from sqlalchemy.orm import relationship
+from app.database import Base, utc_now
+
+
+class UserAgentSignature(Base):
+    """
+    Parsed user agent, shared by all clicks with the same UA string.
+    
+    Attributes:
+        id: Primary key
+        ua_hash: Signed 64-bit hash of the raw user agent string
+        user_agent: Raw user agent string (truncated to 500 chars)
+        device_type: Device type (mobile, desktop, tablet)
+        browser: Browser name
+        os: Operating system
+        created_at: When this user agent was first seen
+    """
+    
+    __tablename__ = "user_agent_signatures"
+    
+    # Primary Key
+    id = Column(Integer, primary_key=True, index=True)
+    
+    # Lookup key
+    ua_hash = Column(BigInteger, unique=True, nullable=False)
+    
+    # Raw and parsed user agent
+    user_agent = Column(String(500), nullable=True)
+    device_type = Column(String(50), nullable=True)  # mobile, desktop, tablet
+    browser = Column(String(100), nullable=True)
+    os = Column(String(100), nullable=True)
+    
+    # Timestamp
+    created_at = Column(DateTime, server_default=utc_now, nullable=False)
+    
+    # Relationships
+    click_events = relationship("ClickEvent", back_populates="ua_signature")
+    
+    def __repr__(self):
+        return f"<UserAgentSignature id={self.id} device={self.device_type} browser={self.browser} os={self.os}>"
+    
+    # Serialized by app.core.responses.ORJSONResponse
+    _json_fields = (
+        "id", "user_agent", "device_type", "browser", "os",
+    )
@@ -1,65 +1,93 @@
-from sqlalchemy.orm import Session
+import re
+
+from sqlalchemy import exists, select
+from sqlalchemy.orm import Session, joinedload
 from sqlalchemy.exc import IntegrityError
 from fastapi import HTTPException
+from starlette.concurrency import run_in_threadpool
 from app.models.user import User
 from app.models.company import Company
-from app.core.security import hash_password, verify_password, create_access_token, validate_password_strength
+from app.core.security import hash_password_async, verify_password_async, validate_password_strength
 from app.schemas.user import UserCreate, UserLogin
 
-def register_new_user(db: Session, user_data: UserCreate):
+# Spaces and underscores in company names become dashes in the slug
+_SLUG_RE = re.compile(r"[ _]")
+
+# Unique constraint/index name -> registration error
+# (companies.name/slug are unique indexes, created from unique=True, index=True)
+_REGISTRATION_CONFLICTS = {
+    "uq_user_email_company": "Email already registered",
+    "ix_companies_name": "Company name already taken",
+    "ix_companies_slug": "Company name already taken",
+}
+
+# The handlers are async so bcrypt can run on its own pool (see
+# app.core.security) without holding a threadpool slot; the blocking DB work
+# below is pushed to the threadpool explicitly.
+
+async def register_new_user(db: Session, user_data: UserCreate):
 
     pw_validation = validate_password_strength(user_data.password)
     if not pw_validation[0]:
         raise HTTPException(status_code=400, detail=pw_validation[1])
     
-    existing_user = db.query(User).filter(User.email == user_data.email).first()
-    if existing_user:
+    await run_in_threadpool(_check_email_available, db, user_data)
+    hashed_password = await hash_password_async(user_data.password)
+    return await run_in_threadpool(_create_company_and_user, db, user_data, hashed_password)
+
+
+def _check_email_available(db: Session, user_data: UserCreate):
+    # Emails are only unique per company in the schema and registration
+    # always creates a new company, so the constraint can't catch an email
+    # already used elsewhere; company name clashes are left to the
+    # unique indexes (see _create_company_and_user)
+    if db.scalar(select(exists().where(User.email == user_data.email))):
         raise HTTPException(status_code=400, detail="Email already registered")
-    
-    existing_company = db.query(Company).filter(Company.name == user_data.company_name).first()
-    if existing_company:
-        raise HTTPException(status_code=400, detail="Company name already taken")
-    
+
+
+def _create_company_and_user(db: Session, user_data: UserCreate, hashed_password: str):
     try:
         company = Company(
             name=user_data.company_name,
-            slug=user_data.company_name.lower().replace(" ", "-").replace("_", "-")
+            slug=_SLUG_RE.sub("-", user_data.company_name.lower())
         )
-        db.add(company)
-        db.flush()  # Get company.id without committing
-        
+        # Linked via the relationship: the flush inserts the company first
+        # and fills user.company_id, and user.company needs no lazy load
         user = User(
             full_name=user_data.full_name,
             email=user_data.email,
-            hashed_password=hash_password(user_data.password), 
-            company_id=company.id
+            hashed_password=hashed_password, 
+            company=company
         )
         db.add(user)
         
+        # Server-generated columns come back via INSERT ... RETURNING, so
+        # no refresh SELECTs are needed after the commit
         db.commit()
         
-        db.refresh(user)
-        db.refresh(company)
-        
         return user
         
     except IntegrityError as e:
         db.rollback()
-        # Handle unique constraint violations
-        if "email" in str(e).lower():
-            raise HTTPException(status_code=400, detail="Email already registered")
-        elif "slug" in str(e).lower() or "name" in str(e).lower():
-            raise HTTPException(status_code=400, detail="Company name already taken")
-        else:
-            raise HTTPException(status_code=400, detail="Registration failed due to data conflict")
+        # Map unique violations by constraint name, not message text
+        diag = getattr(e.orig, "diag", None)
+        detail = _REGISTRATION_CONFLICTS.get(getattr(diag, "constraint_name", None))
+        raise HTTPException(status_code=400, detail=detail or "Registration failed due to data conflict")
     except Exception as e:
         db.rollback()
         raise HTTPException(status_code=500, detail=f"Registration failed: {str(e)}")
 
 
-def login_user(db: Session, user_data: UserLogin):
+async def login_user(db: Session, user_data: UserLogin):
 
-    user = db.query(User).filter(User.email == user_data.email).first()
+    # User and company in one round-trip (the response serializes both)
+    user = await run_in_threadpool(
+        lambda: db.execute(
+            select(User)
+            .options(joinedload(User.company))
+            .where(User.email == user_data.email)
+        ).unique().scalars().first()
+    )
     
     if not user:
         raise HTTPException(status_code=401, detail="Invalid email or password")
@@ -67,10 +95,7 @@ def login_user(db: Session, user_data: UserLogin):
     if not user.is_active:
         raise HTTPException(status_code=403, detail="Account is inactive. Please contact support.")
     
-    if not verify_password(user_data.password, user.hashed_password):
+    if not await verify_password_async(user_data.password, user.hashed_password):
         raise HTTPException(status_code=401, detail="Invalid email or password")
     
-    # Load company relationship
-    db.refresh(user)
-    
     return user
\ No newline at end of file
@@ -0,0 +1,60 @@
+"""
+Campaigns Cache
+
+Redis cache of serialized campaign list responses.
+
+Design Decisions:
+- One key per (company, status filter): campaigns:{company_id}:{status|all}
+- Values are the final JSON body, so a hit costs one GET and no
+  validation/serialization
+- Any campaign mutation deletes all of the company's list keys; the set of
+  possible keys is fixed (one per status + "all"), so no SCAN is needed
+- A short TTL bounds staleness for writes that don't invalidate (e.g.
+  send counters updated by workers)
+- Redis errors degrade to a cache miss; Postgres stays the source of truth
+"""
+
+from typing import Optional
+
+import redis
+
+from app.config import settings
+from app.core.logging import get_logger
+from app.models.campaign import CampaignStatus
+
+logger = get_logger(__name__)
+
+CAMPAIGN_LIST_TTL_SECONDS = 60
+
+# Sync client: the campaign routes run in the threadpool
+_redis = redis.Redis.from_url(settings.redis_url, socket_connect_timeout=0.5, socket_timeout=0.5)
+
+
+def _list_key(company_id: int, status: Optional[CampaignStatus]) -> str:
+    return f"campaigns:{company_id}:{status.value if status else 'all'}"
+
+
+def get_campaign_list(company_id: int, status: Optional[CampaignStatus]) -> Optional[bytes]:
+    """Cached list response body, or None on a miss"""
+    try:
+        return _redis.get(_list_key(company_id, status))
+    except redis.RedisError as e:
+        logger.warning("Campaign cache unavailable: %s", e)
+        return None
+
+
+def set_campaign_list(company_id: int, status: Optional[CampaignStatus], body: bytes) -> None:
+    """Store a list response body for CAMPAIGN_LIST_TTL_SECONDS"""
+    try:
+        _redis.setex(_list_key(company_id, status), CAMPAIGN_LIST_TTL_SECONDS, body)
+    except redis.RedisError as e:
+        logger.warning("Campaign cache unavailable: %s", e)
+
+
+def invalidate_campaign_lists(company_id: int) -> None:
+    """Drop every cached campaign list of a company (call after commit)"""
+    keys = [_list_key(company_id, None)] + [_list_key(company_id, status) for status in CampaignStatus]
+    try:
+        _redis.unlink(*keys)
+    except redis.RedisError as e:
+        logger.warning("Campaign cache invalidation failed: %s", e)
@@ -4,12 +4,13 @@ Campaign Router
 API endpoints for campaign management.
 """
 
-from typing import Optional, List
-from fastapi import APIRouter, Depends, HTTPException, status, Body
+from typing import Optional, List, Dict
+from fastapi import APIRouter, Depends, HTTPException, Response, status, Body
+from pydantic import TypeAdapter
 from sqlalchemy.orm import Session
 
 from app.database import get_db
-from app.modules.campaigns import service
+from app.modules.campaigns import cache, service
 from app.schemas.campaign import (
     CampaignCreate,
     CampaignUpdate,
@@ -23,6 +24,9 @@ from app.models.campaign import CampaignStatus
 
 router = APIRouter()
 
+# Validates and serializes a whole list of ORM rows in pydantic-core
+_CAMPAIGN_LIST_ADAPTER = TypeAdapter(List[CampaignResponse])
+
 
 @router.post("", response_model=CampaignResponse, status_code=status.HTTP_201_CREATED)
 def create_campaign(
@@ -53,11 +57,21 @@ def list_campaigns(
     List all campaigns for the current user's company.
     
     - **status**: Optional filter by campaign status
+    
+    Served from a per-company Redis cache (60s TTL, invalidated on change).
     """
     logger.info(f"Listing campaigns for user {current_user.user_id}")
     
-    campaigns = service.list_campaigns(db, current_user, status)
-    return [campaign_to_response(c) for c in campaigns]
+    body = cache.get_campaign_list(current_user.company_id, status)
+    if body is None:
+        campaigns = service.list_campaigns(db, current_user, status)
+        body = _CAMPAIGN_LIST_ADAPTER.dump_json(
+            _CAMPAIGN_LIST_ADAPTER.validate_python(campaigns, from_attributes=True)
+        )
+        cache.set_campaign_list(current_user.company_id, status, body)
+    
+    # Already serialized (cached or not), so skip response_model encoding
+    return Response(content=body, media_type="application/json")
 
 
 @router.get("/{campaign_id}", response_model=CampaignResponse)
@@ -147,3 +161,17 @@ def cancel_campaign(
         raise HTTPException(status_code=404, detail="Campaign not found")
     
     return result
+
+
+@router.get("/{campaign_id}/status-counts", response_model=Dict[str, int])
+def get_campaign_status_counts(
+    campaign_id: int,
+    db: Session = Depends(get_db),
+    current_user: CurrentUser = Depends(get_current_user)
+):
+    """Message counts per delivery status (refreshed every ~30s)"""
+    result = service.get_campaign_status_counts(db, current_user, campaign_id)
+    if result is None:
+        raise HTTPException(status_code=404, detail="Campaign not found")
+    
+    return result
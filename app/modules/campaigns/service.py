@@ -4,13 +4,18 @@ Campaign Service
 Business logic for campaign operations.
 """
 
-from typing import Optional, List
-from datetime import datetime
-from sqlalchemy.orm import Session
+from typing import Optional, List, Dict
+from sqlalchemy import select
+from sqlalchemy.orm import Session, raiseload
 from sqlalchemy.exc import IntegrityError
 from fastapi import HTTPException
+from redis import RedisError
 
+from app.database import utc_now
 from app.models.campaign import Campaign, CampaignStatus
+from app.models.message_log import campaign_status_counts
+from app.modules.campaigns.cache import invalidate_campaign_lists
+from app.workers.queue import enqueue_campaign_send
 from app.core.dependencies import CurrentUser
 from app.schemas.campaign import CampaignCreate, CampaignUpdate
 
@@ -46,9 +51,11 @@ def create_campaign(
             created_by=current_user.user_id
         )
         
+        # id and the server-default timestamps come back via INSERT ...
+        # RETURNING, and expire_on_commit is off: no refresh SELECT needed
         db.add(db_campaign)
         db.commit()
-        db.refresh(db_campaign)
+        invalidate_campaign_lists(current_user.company_id)
         
         return db_campaign
         
@@ -73,19 +80,21 @@ def list_campaigns(
     Returns:
         List of Campaign objects
     """
-    # Query campaigns for user's company (multi-tenant isolation)
-    query = db.query(Campaign).filter(
+    # Query campaigns for user's company (multi-tenant isolation).
+    # campaign_to_response only reads columns; raiseload turns any future
+    # relationship access here into an error instead of a query per row.
+    stmt = select(Campaign).options(raiseload("*")).where(
         Campaign.company_id == current_user.company_id
     )
     
     # Apply status filter if provided
     if status:
-        query = query.filter(Campaign.status == status)
+        stmt = stmt.where(Campaign.status == status)
     
     # Order by most recent first
-    query = query.order_by(Campaign.created_at.desc())
+    stmt = stmt.order_by(Campaign.created_at.desc())
     
-    return query.all()
+    return db.execute(stmt).scalars().all()
 
 
 def get_campaign_by_id(
@@ -104,10 +113,11 @@ def get_campaign_by_id(
     Returns:
         Campaign object or None if not found
     """
-    return db.query(Campaign).filter(
-        Campaign.id == campaign_id,
-        Campaign.company_id == current_user.company_id  # Multi-tenant isolation
-    ).first()
+    # Identity map first (no SQL if already loaded), then a PK lookup
+    campaign = db.get(Campaign, campaign_id)
+    if campaign is None or campaign.company_id != current_user.company_id:  # Multi-tenant isolation
+        return None
+    return campaign
 
 
 def update_campaign(
@@ -148,12 +158,11 @@ def update_campaign(
     for key, value in update_data.items():
         setattr(db_campaign, key, value)
     
-    # Update timestamp
-    db_campaign.updated_at = datetime.utcnow()
-    
+    # updated_at comes from the column's onupdate (Postgres clock) and is
+    # read back via RETURNING (eager_defaults), so no refresh after commit
     db.add(db_campaign)
     db.commit()
-    db.refresh(db_campaign)
+    invalidate_campaign_lists(current_user.company_id)
     
     return db_campaign
 
@@ -190,6 +199,7 @@ def delete_campaign(
     
     db.delete(db_campaign)
     db.commit()
+    invalidate_campaign_lists(current_user.company_id)
     
     return True
 
@@ -226,18 +236,25 @@ def send_campaign(
     
     # Update status
     db_campaign.status = CampaignStatus.SENDING
-    db_campaign.started_at = datetime.utcnow()
+    db_campaign.started_at = utc_now
     
     db.add(db_campaign)
-    db.commit()
+    # Flush first: the row lock held until commit makes the sender worker
+    # (SELECT ... FOR UPDATE) wait for this transaction, even if it pops
+    # the campaign id before we commit
+    db.flush()
     
-    # TODO: Queue campaign for background processing
-    # This would typically:
-    # 1. Add to Redis queue
-    # 2. Background worker picks it up
-    # 3. Sends messages to all recipients
-    # 4. Updates message_logs
-    # 5. Updates campaign stats
+    try:
+        enqueue_campaign_send(campaign_id)
+    except RedisError:
+        db.rollback()
+        raise HTTPException(
+            status_code=503,
+            detail="Send queue unavailable, please try again"
+        )
+    
+    db.commit()
+    invalidate_campaign_lists(current_user.company_id)
     
     return {
         "campaign_id": campaign_id,
@@ -279,13 +296,44 @@ def cancel_campaign(
     
     # Update status
     db_campaign.status = CampaignStatus.CANCELLED
-    db_campaign.updated_at = datetime.utcnow()
     
     db.add(db_campaign)
     db.commit()
+    invalidate_campaign_lists(current_user.company_id)
     
     return {
         "campaign_id": campaign_id,
         "status": "cancelled",
         "message": "Campaign cancelled successfully"
-    }
\ No newline at end of file
+    }
+
+
+def get_campaign_status_counts(
+    db: Session,
+    current_user: CurrentUser,
+    campaign_id: int
+) -> Optional[Dict[str, int]]:
+    """
+    Get message counts per delivery status for a campaign.
+    
+    Reads the mv_campaign_status_counts materialized view (refreshed in the
+    background), so the numbers can lag live message_logs by one refresh
+    interval.
+    
+    Args:
+        db: Database session
+        current_user: Authenticated user context
+        campaign_id: Campaign ID
+    
+    Returns:
+        Dict of status -> message count, or None if campaign not found
+    """
+    db_campaign = get_campaign_by_id(db, current_user, campaign_id)
+    if not db_campaign:
+        return None
+    
+    rows = db.execute(
+        select(campaign_status_counts.c.status, campaign_status_counts.c.n)
+        .where(campaign_status_counts.c.campaign_id == campaign_id)
+    )
+    return {status.value: n for status, n in rows}
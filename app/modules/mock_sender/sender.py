@@ -0,0 +1,34 @@
+"""
+Mock Sender
+
+Stand-in for the WhatsApp client while the API integration (Phase 2) is
+not wired up.
+
+Design Decisions:
+- Same call shape the real client will have: one message in, the
+  provider message ID out, an exception on failure
+- Every message "succeeds"; nothing leaves the process
+- Message IDs are prefixed with "mock." so they can never be confused
+  with real WhatsApp IDs in message_logs
+"""
+
+import uuid
+
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+def send_message(phone_number: str, message: str) -> str:
+    """
+    Pretend to send a WhatsApp text message.
+    
+    Args:
+        phone_number: Recipient number (E.164)
+        message: Rendered message body
+    
+    Returns:
+        Provider message ID
+    """
+    logger.debug("Mock send to %s (%d chars)", phone_number, len(message))
+    return f"mock.{uuid.uuid4().hex}"
@@ -4,7 +4,7 @@ Recipients Router
 API endpoints for recipient management.
 """
 
-from typing import List
+from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException, status, File, UploadFile, Query
 from sqlalchemy.orm import Session
 
@@ -18,6 +18,7 @@ from app.schemas.recipient import (
     RecipientUploadResponse
 )
 from app.core.logging import logger
+from app.core.responses import ORJSONResponse
 from app.core.dependencies import get_current_user, CurrentUser
 
 router = APIRouter()
@@ -115,33 +116,32 @@ async def upload_recipients_csv(
 )
 def list_recipients(
     campaign_id: int,
-    page: int = Query(1, ge=1, description="Page number"),
+    cursor: Optional[int] = Query(None, ge=0, description="next_cursor from the previous page"),
     page_size: int = Query(50, ge=1, le=100, description="Items per page"),
     db: Session = Depends(get_db),
     current_user: CurrentUser = Depends(get_current_user)
 ):
     """
-    List all recipients for a campaign with pagination.
+    List all recipients for a campaign with cursor pagination.
     
-    - **page**: Page number (starts at 1)
+    - **cursor**: Omit for the first page, then pass the previous `next_cursor`
     - **page_size**: Number of items per page (1-100)
     """
-    logger.info(f"Listing recipients for campaign {campaign_id}, page {page}")
+    logger.info(f"Listing recipients for campaign {campaign_id}, cursor {cursor}")
     
-    skip = (page - 1) * page_size
     recipients, total = service.list_recipients(
-        db, current_user, campaign_id, skip, page_size
+        db, current_user, campaign_id, cursor, page_size
     )
     
-    total_pages = (total + page_size - 1) // page_size
-    
-    return RecipientListResponse(
-        recipients=[RecipientResponse.model_validate(r) for r in recipients],
-        total=total,
-        page=page,
-        page_size=page_size,
-        total_pages=total_pages
-    )
+    # Rows come typed from the database: serialize the ORM objects directly
+    # (Recipient._json_fields) instead of validating a RecipientResponse per
+    # row; response_model only documents the shape
+    return ORJSONResponse({
+        "recipients": recipients,
+        "total": total,
+        "page_size": page_size,
+        "next_cursor": recipients[-1].id if len(recipients) == page_size else None,
+    })
 
 
 @router.get(
@@ -4,15 +4,21 @@ Recipients Service
 Business logic for recipient management.
 """
 
-from typing import List, Optional
+from typing import BinaryIO, Iterable, Iterator, List, Optional, Tuple
+from itertools import islice
 import csv
 import io
+import orjson
+from sqlalchemy import delete, exists, select, update
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 from fastapi import HTTPException, UploadFile
+from starlette.concurrency import run_in_threadpool
 
-from app.models.recipient import Recipient
+from app.models.recipient import Recipient, E164_RE, to_e164
 from app.models.campaign import Campaign
+from app.modules.campaigns.cache import invalidate_campaign_lists
 from app.core.dependencies import CurrentUser
 from app.schemas.recipient import (
     RecipientCreate,
@@ -40,17 +46,38 @@ def get_campaign_or_404(
     Raises:
         HTTPException: If campaign not found or doesn't belong to company
     """
-    campaign = db.query(Campaign).filter(
-        Campaign.id == campaign_id,
-        Campaign.company_id == current_user.company_id
-    ).first()
+    campaign = db.get(Campaign, campaign_id)
     
-    if not campaign:
+    if not campaign or campaign.company_id != current_user.company_id:
         raise HTTPException(status_code=404, detail="Campaign not found")
     
     return campaign
 
 
+def verify_campaign_access(
+    db: Session,
+    current_user: CurrentUser,
+    campaign_id: int
+) -> None:
+    """
+    Verify a campaign exists and belongs to user's company, without loading it.
+    
+    For paths that don't touch the Campaign object itself; use
+    get_campaign_or_404 when the campaign is read or modified.
+    
+    Raises:
+        HTTPException: If campaign not found or doesn't belong to company
+    """
+    found = db.scalar(
+        select(exists().where(
+            Campaign.id == campaign_id,
+            Campaign.company_id == current_user.company_id
+        ))
+    )
+    if not found:
+        raise HTTPException(status_code=404, detail="Campaign not found")
+
+
 def add_single_recipient(
     db: Session,
     current_user: CurrentUser,
@@ -75,18 +102,6 @@ def add_single_recipient(
     # Verify campaign exists and belongs to user's company
     campaign = get_campaign_or_404(db, current_user, campaign_id)
     
-    # Check if recipient already exists
-    existing = db.query(Recipient).filter(
-        Recipient.campaign_id == campaign_id,
-        Recipient.phone_number == recipient_data.phone_number
-    ).first()
-    
-    if existing:
-        raise HTTPException(
-            status_code=400,
-            detail=f"Recipient with phone number {recipient_data.phone_number} already exists in this campaign"
-        )
-    
     # Create recipient
     recipient = Recipient(
         campaign_id=campaign_id,
@@ -98,17 +113,34 @@ def add_single_recipient(
     
     db.add(recipient)
     
-    # Update campaign total_recipients count
-    campaign.total_recipients = db.query(Recipient).filter(
-        Recipient.campaign_id == campaign_id
-    ).count() + 1
+    # Update campaign total_recipients count (incremented in SQL, no COUNT(*))
+    campaign.total_recipients = Campaign.total_recipients + 1
     
-    db.commit()
-    db.refresh(recipient)
+    # No existence pre-check: uq_recipient_campaign_phone rejects duplicates
+    # atomically. created_at comes back via INSERT ... RETURNING.
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(
+            status_code=400,
+            detail=f"Recipient with phone number {recipient_data.phone_number} already exists in this campaign"
+        )
+    invalidate_campaign_lists(current_user.company_id)
     
     return recipient
 
 
+# Built once: a fixed statement compiles once and stays in SQLAlchemy's
+# statement cache; executed with a list of rows it is sent as batched
+# multi-row VALUES (insertmanyvalues) with RETURNING
+_INSERT_RECIPIENTS = (
+    insert(Recipient)
+    .on_conflict_do_nothing(index_elements=[Recipient.campaign_id, Recipient.phone_number])
+    .returning(Recipient.id)
+)
+
+
 def add_bulk_recipients(
     db: Session,
     current_user: CurrentUser,
@@ -130,52 +162,233 @@ def add_bulk_recipients(
     # Verify campaign exists and belongs to user's company
     campaign = get_campaign_or_404(db, current_user, campaign_id)
     
-    added_count = 0
-    duplicate_count = 0
-    error_count = 0
-    errors = []
-    
-    for idx, recipient_data in enumerate(bulk_data.recipients, start=1):
-        try:
-            # Check for duplicate
-            existing = db.query(Recipient).filter(
-                Recipient.campaign_id == campaign_id,
-                Recipient.phone_number == recipient_data.phone_number
-            ).first()
-            
-            if existing:
-                duplicate_count += 1
-                continue
-            
-            # Create recipient
-            recipient = Recipient(
-                campaign_id=campaign_id,
-                phone_number=recipient_data.phone_number,
-                name=recipient_data.name,
-                email=recipient_data.email,
-                custom_data=recipient_data.custom_data
-            )
-            db.add(recipient)
-            added_count += 1
-            
-        except Exception as e:
-            error_count += 1
-            errors.append(f"Recipient {idx}: {str(e)}")
+    # Phone numbers are already normalized by RecipientCreate
+    rows = [
+        {
+            "campaign_id": campaign_id,
+            "phone_number": recipient_data.phone_number,
+            "name": recipient_data.name,
+            "email": recipient_data.email,
+            "custom_data": recipient_data.custom_data,
+        }
+        for recipient_data in bulk_data.recipients
+    ]
+    
+    # Numbers already in the campaign are skipped by the unique constraint
+    # instead of being looked up first
+    inserted_ids = db.execute(_INSERT_RECIPIENTS, rows).scalars().all()
+    added_count = len(inserted_ids)
     
     # Update campaign total_recipients count
-    campaign.total_recipients = db.query(Recipient).filter(
-        Recipient.campaign_id == campaign_id
-    ).count()
+    campaign.total_recipients = Campaign.total_recipients + added_count
     
     db.commit()
+    invalidate_campaign_lists(current_user.company_id)
     
     return RecipientUploadResponse(
         campaign_id=campaign_id,
         added_count=added_count,
-        duplicate_count=duplicate_count,
-        error_count=error_count,
-        errors=errors if errors else None
+        duplicate_count=len(rows) - added_count,
+        error_count=0,
+        errors=None
+    )
+
+
+# Parsed CSV rows copied and committed per batch (bounds memory and
+# transaction size per upload)
+COPY_BATCH_SIZE = 1000
+
+# Read buffer for CSV uploads; larger reads mean fewer calls into a spooled
+# (on-disk) upload than the default 8 KiB
+CSV_READ_BUFFER_SIZE = 1 << 20
+
+RecipientRow = Tuple[str, Optional[str], Optional[str], Optional[str]]
+
+# CSV columns mapped to Recipient fields; any other column is custom_data
+_RECIPIENT_COLUMNS = frozenset({'phone_number', 'name', 'email'})
+
+
+def _copy_recipients(
+    db: Session,
+    campaign_id: int,
+    rows: Iterable[RecipientRow]
+) -> Tuple[int, int]:
+    """
+    Bulk insert parsed CSV rows with COPY, bypassing the ORM.
+    
+    Rows are consumed COPY_BATCH_SIZE at a time, as they are parsed. COPY
+    can't skip conflicting rows, so each batch is copied into a temp table,
+    moved into recipients with INSERT ... ON CONFLICT DO NOTHING, added to
+    the campaign's total_recipients and committed. A failure part-way keeps
+    the batches already committed (the counter always matches them).
+    
+    Args:
+        db: Database session
+        campaign_id: Campaign ID
+        rows: (phone_number, name, email, custom_data JSON) tuples
+    
+    Returns:
+        (rows copied, recipients inserted)
+    """
+    copied = 0
+    inserted = 0
+    rows = iter(rows)
+    # One COPY buffer per upload, rewound and reused for every batch
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    while batch := list(islice(rows, COPY_BATCH_SIZE)):
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows(batch)  # None -> empty field -> NULL
+        buffer.seek(0)
+        
+        # Each commit may hand back a different pooled connection, so the
+        # temp table is (re)created per batch; its rows go away on commit
+        cursor = db.connection().connection.cursor()
+        try:
+            # COPY plus the ON CONFLICT insert can outlast the pool-wide
+            # statement_timeout; lift it for this batch's transaction only
+            cursor.execute("SET LOCAL statement_timeout = 0")
+            cursor.execute(
+                "CREATE TEMP TABLE IF NOT EXISTS recipients_import "
+                "(phone_number text, name text, email text, custom_data jsonb) ON COMMIT DELETE ROWS"
+            )
+            cursor.copy_expert("COPY recipients_import FROM STDIN WITH (FORMAT csv)", buffer)
+            cursor.execute(
+                "INSERT INTO recipients (campaign_id, phone_number, name, email, custom_data) "
+                "SELECT %s, phone_number, name, email, custom_data FROM recipients_import "
+                "ON CONFLICT (campaign_id, phone_number) DO NOTHING",
+                (campaign_id,)
+            )
+            batch_inserted = cursor.rowcount
+        finally:
+            cursor.close()
+        
+        db.execute(
+            update(Campaign)
+            .where(Campaign.id == campaign_id)
+            .values(total_recipients=Campaign.total_recipients + batch_inserted),
+            execution_options={"synchronize_session": False}
+        )
+        db.commit()
+        
+        copied += len(batch)
+        inserted += batch_inserted
+    
+    return copied, inserted
+
+
+def _parse_recipients_csv(file: BinaryIO, errors: List[str]) -> Iterator[RecipientRow]:
+    """
+    Parse an uploaded recipients CSV into rows ready for _copy_recipients.
+    
+    The file is decoded and parsed as it is consumed, so neither the raw
+    upload nor the full list of rows is ever held in memory. The header is
+    checked up front, before anything is written to the database.
+    
+    Args:
+        file: Binary file object of the upload
+        errors: Receives one message per rejected row
+    
+    Returns:
+        Iterator of (phone_number, name, email, custom_data JSON) tuples
+    
+    Raises:
+        HTTPException: If the file isn't UTF-8, isn't valid CSV (e.g. a field
+            over csv.field_size_limit()) or has no phone_number column
+    """
+    buffered = io.BufferedReader(file, buffer_size=CSV_READ_BUFFER_SIZE)
+    csv_reader = csv.reader(io.TextIOWrapper(buffered, encoding='utf-8', newline=''))
+    
+    try:
+        header = next(csv_reader, None) or []
+    except (UnicodeDecodeError, csv.Error) as e:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Failed to read CSV file: {str(e)}"
+        )
+    
+    # Validate required column
+    if 'phone_number' not in header:
+        raise HTTPException(
+            status_code=400,
+            detail="CSV must have a 'phone_number' column"
+        )
+    
+    # Column positions are resolved once from the header; rows are plain
+    # lists indexed directly (no dict per row, no per-cell name lookups)
+    columns = (
+        header.index('phone_number'),
+        header.index('name') if 'name' in header else None,
+        header.index('email') if 'email' in header else None,
+    )
+    custom_columns = tuple(
+        (idx, key) for idx, key in enumerate(header) if key not in _RECIPIENT_COLUMNS
     )
+    
+    return _iter_recipient_rows(csv_reader, len(header), columns, custom_columns, errors)
+
+
+def _iter_recipient_rows(
+    csv_reader: Iterator[List[str]],
+    width: int,
+    columns: Tuple[int, Optional[int], Optional[int]],
+    custom_columns: Tuple[Tuple[int, str], ...],
+    errors: List[str]
+) -> Iterator[RecipientRow]:
+    """Validate and yield CSV rows (see _parse_recipients_csv)"""
+    phone_idx, name_idx, email_idx = columns
+    # Bound once: this loop runs per CSV row, so skip the repeated
+    # global/attribute lookups
+    match_e164 = E164_RE.match
+    dumps = orjson.dumps
+    add_error = errors.append
+    try:
+        for row_num, row in enumerate(csv_reader, start=2):  # Start at 2 (header is row 1)
+            if not row:
+                continue  # Blank line
+            if len(row) < width:
+                row += [''] * (width - len(row))
+            
+            try:
+                # Validate phone_number
+                phone_number = row[phone_idx].strip()
+                if not phone_number:
+                    add_error(f"Row {row_num}: Missing phone_number")
+                    continue
+                phone_number = to_e164(phone_number)
+                if not match_e164(phone_number):
+                    add_error(f"Row {row_num}: Invalid phone_number {phone_number}")
+                    continue
+                
+                # Get name and email
+                name = row[name_idx].strip() or None if name_idx is not None else None
+                email = row[email_idx].strip() or None if email_idx is not None else None
+                
+                # Get custom data (all columns except phone_number, name, and email)
+                custom_data = {
+                    key: value
+                    for idx, key in custom_columns
+                    if (value := row[idx].strip())
+                }
+                
+                parsed = (
+                    phone_number,
+                    name,
+                    email,
+                    dumps(custom_data).decode() if custom_data else None
+                )
+                
+            except Exception as e:
+                add_error(f"Row {row_num}: {str(e)}")
+                continue
+            
+            yield parsed
+    except (UnicodeDecodeError, csv.Error) as e:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Failed to read CSV file: {str(e)}"
+        )
 
 
 async def upload_recipients_csv(
@@ -201,9 +414,6 @@ async def upload_recipients_csv(
     Returns:
         RecipientUploadResponse with counts and errors
     """
-    # Verify campaign exists and belongs to user's company
-    campaign = get_campaign_or_404(db, current_user, campaign_id)
-    
     # Validate file type
     if not file.filename.endswith('.csv'):
         raise HTTPException(
@@ -211,81 +421,23 @@ async def upload_recipients_csv(
             detail="File must be a CSV file"
         )
     
-    # Read CSV file
-    try:
-        contents = await file.read()
-        csv_data = contents.decode('utf-8')
-    except Exception as e:
-        raise HTTPException(
-            status_code=400,
-            detail=f"Failed to read CSV file: {str(e)}"
-        )
-    
-    # Parse CSV
-    csv_reader = csv.DictReader(io.StringIO(csv_data))
-    
-    # Validate required column
-    if 'phone_number' not in csv_reader.fieldnames:
-        raise HTTPException(
-            status_code=400,
-            detail="CSV must have a 'phone_number' column"
-        )
+    # Verify campaign exists and belongs to user's company (blocking query,
+    # so off the event loop like the import itself)
+    await run_in_threadpool(verify_campaign_access, db, current_user, campaign_id)
     
-    added_count = 0
-    duplicate_count = 0
-    error_count = 0
+    # Parsing is streamed straight into COPY; decoding + parsing is
+    # CPU-bound, so the whole pipeline runs off the event loop.
+    # Duplicates (already in the campaign, or repeated in the file) are
+    # skipped by the insert itself instead of a SELECT per row.
+    # Batches are committed (with total_recipients) as they go.
     errors = []
+    copied_count, added_count = await run_in_threadpool(
+        lambda: _copy_recipients(db, campaign_id, _parse_recipients_csv(file.file, errors))
+    )
+    error_count = len(errors)
+    duplicate_count = copied_count - added_count
     
-    for row_num, row in enumerate(csv_reader, start=2):  # Start at 2 (header is row 1)
-        try:
-            # Validate phone_number
-            phone_number = row.get('phone_number', '').strip()
-            if not phone_number:
-                errors.append(f"Row {row_num}: Missing phone_number")
-                error_count += 1
-                continue
-            
-            # Get name and email
-            name = row.get('name', '').strip() or None
-            email = row.get('email', '').strip() or None
-            
-            # Get custom data (all columns except phone_number, name, and email)
-            custom_data = {}
-            for key, value in row.items():
-                if key not in ['phone_number', 'name', 'email'] and value and value.strip():
-                    custom_data[key] = value.strip()
-            
-            # Check for duplicate
-            existing = db.query(Recipient).filter(
-                Recipient.campaign_id == campaign_id,
-                Recipient.phone_number == phone_number
-            ).first()
-            
-            if existing:
-                duplicate_count += 1
-                continue
-            
-            # Create recipient
-            recipient = Recipient(
-                campaign_id=campaign_id,
-                phone_number=phone_number,
-                name=name,
-                email=email,
-                custom_data=custom_data if custom_data else None
-            )
-            db.add(recipient)
-            added_count += 1
-            
-        except Exception as e:
-            errors.append(f"Row {row_num}: {str(e)}")
-            error_count += 1
-    
-    # Update campaign total_recipients count
-    campaign.total_recipients = db.query(Recipient).filter(
-        Recipient.campaign_id == campaign_id
-    ).count()
-    
-    db.commit()
+    await run_in_threadpool(invalidate_campaign_lists, current_user.company_id)
     
     return RecipientUploadResponse(
         campaign_id=campaign_id,
@@ -300,34 +452,41 @@ def list_recipients(
     db: Session,
     current_user: CurrentUser,
     campaign_id: int,
-    skip: int = 0,
+    cursor: Optional[int] = None,
     limit: int = 50
 ) -> tuple[List[Recipient], int]:
     """
-    List recipients for a campaign with pagination.
+    List recipients for a campaign with keyset pagination.
+    
+    Pages are ordered by id and start after `cursor`, so every page costs
+    the same index range scan (no OFFSET rows read and discarded).
     
     Args:
         db: Database session
         current_user: Authenticated user
         campaign_id: Campaign ID
-        skip: Number of records to skip
+        cursor: Last recipient id of the previous page (None = first page)
         limit: Maximum number of records to return
     
     Returns:
         Tuple of (recipients list, total count)
     """
-    # Verify campaign exists and belongs to user's company
-    campaign = get_campaign_or_404(db, current_user, campaign_id)
-    
-    # Get total count
-    total = db.query(Recipient).filter(
-        Recipient.campaign_id == campaign_id
-    ).count()
+    # Verify campaign exists and belongs to user's company. Only the
+    # counter is needed (maintained on every recipient change; no COUNT(*)
+    # per page), so the campaign row isn't hydrated.
+    total = db.scalar(
+        select(Campaign.total_recipients).where(
+            Campaign.id == campaign_id,
+            Campaign.company_id == current_user.company_id
+        )
+    )
+    if total is None:
+        raise HTTPException(status_code=404, detail="Campaign not found")
     
-    # Get paginated recipients
-    recipients = db.query(Recipient).filter(
-        Recipient.campaign_id == campaign_id
-    ).offset(skip).limit(limit).all()
+    stmt = select(Recipient).where(Recipient.campaign_id == campaign_id)
+    if cursor is not None:
+        stmt = stmt.where(Recipient.id > cursor)
+    recipients = db.execute(stmt.order_by(Recipient.id).limit(limit)).scalars().all()
     
     return recipients, total
 
@@ -351,7 +510,7 @@ def get_recipient_by_id(
         Recipient object or None
     """
     # Verify campaign exists and belongs to user's company
-    campaign = get_campaign_or_404(db, current_user, campaign_id)
+    verify_campaign_access(db, current_user, campaign_id)
     
     return db.query(Recipient).filter(
         Recipient.id == recipient_id,
@@ -385,13 +544,15 @@ def delete_recipient(
     db.delete(recipient)
     
     # Update campaign total_recipients count
-    campaign = db.query(Campaign).filter(Campaign.id == campaign_id).first()
-    if campaign:
-        campaign.total_recipients = db.query(Recipient).filter(
-            Recipient.campaign_id == campaign_id
-        ).count() - 1
+    db.execute(
+        update(Campaign)
+        .where(Campaign.id == campaign_id)
+        .values(total_recipients=Campaign.total_recipients - 1),
+        execution_options={"synchronize_session": False}
+    )
     
     db.commit()
+    invalidate_campaign_lists(current_user.company_id)
     
     return True
 
@@ -412,22 +573,29 @@ def delete_all_recipients(
     Returns:
         Number of recipients deleted
     """
-    # Verify campaign exists and belongs to user's company
-    campaign = get_campaign_or_404(db, current_user, campaign_id)
-    
-    # Count recipients
-    count = db.query(Recipient).filter(
-        Recipient.campaign_id == campaign_id
-    ).count()
-    
-    # Delete all recipients
-    db.query(Recipient).filter(
-        Recipient.campaign_id == campaign_id
-    ).delete()
+    # Reset the counter and verify ownership in one statement: no row
+    # comes back if the campaign doesn't exist or belongs to another company
+    updated = db.execute(
+        update(Campaign)
+        .where(
+            Campaign.id == campaign_id,
+            Campaign.company_id == current_user.company_id
+        )
+        .values(total_recipients=0)
+        .returning(Campaign.id),
+        execution_options={"synchronize_session": False}
+    ).first()
+    if updated is None:
+        raise HTTPException(status_code=404, detail="Campaign not found")
     
-    # Update campaign total_recipients count
-    campaign.total_recipients = 0
+    # One DELETE; its rowcount is the number removed (no separate COUNT).
+    # Message logs go with them via the ON DELETE CASCADE foreign key.
+    count = db.execute(
+        delete(Recipient).where(Recipient.campaign_id == campaign_id),
+        execution_options={"synchronize_session": False}
+    ).rowcount
     
     db.commit()
+    invalidate_campaign_lists(current_user.company_id)
     
     return count
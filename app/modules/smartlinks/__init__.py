@@ -0,0 +1,9 @@
+"""
+Smart Links Module
+
+Smart link redirects and click tracking.
+"""
+
+from app.modules.smartlinks import router, service
+
+__all__ = ["router", "service"]
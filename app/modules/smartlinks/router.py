@@ -0,0 +1,46 @@
+"""
+Smart Links Router
+
+Public redirect endpoint for smart links (mounted at /s, matching
+settings.smart_link_base_url).
+"""
+
+from fastapi import APIRouter, Depends, Request
+from fastapi.responses import RedirectResponse
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app.core.logging import get_logger
+from app.database import get_db
+from app.modules.smartlinks import service
+
+logger = get_logger(__name__)
+
+redirect_router = APIRouter()
+
+
+@redirect_router.get("/{short_code}", response_class=RedirectResponse, status_code=302)
+async def redirect_smart_link(
+    short_code: str,
+    request: Request,
+    db: Session = Depends(get_db)
+):
+    """
+    Redirect a smart link to its destination and record the click.
+    
+    A failure to record the click is logged, never shown to the visitor.
+    """
+    link = await run_in_threadpool(service.get_accessible_link, db, short_code)
+    
+    try:
+        await service.record_click(
+            db,
+            link.id,
+            request.client.host if request.client else None,
+            request.headers.get("user-agent"),
+            request.headers.get("referer"),
+        )
+    except Exception as e:
+        logger.error("Click on smart link %s not recorded: %s", link.id, e)
+    
+    return RedirectResponse(link.destination_url, status_code=302)
@@ -0,0 +1,98 @@
+"""
+Smart Links Service
+
+Business logic for smart link redirects and click ingestion.
+
+Design Decisions:
+- With settings.click_buffer_enabled, a click costs two Redis round-trips
+  (buffer_click + count_click) and the flushers started in the app
+  lifespan write ClickEvents and counters to Postgres in batches
+- Otherwise the click is written directly: one ClickEvent INSERT plus
+  SmartLink.record_click (exact unique count via smart_link_unique_ips)
+  in a single transaction
+- Either way the user agent is interned once via get_ua_signature_id
+- A click holds at most one pooled connection at a time: the link lookup
+  ends its transaction before the click is recorded, and the direct write
+  reuses the request's session
+"""
+
+from typing import Optional
+
+from fastapi import HTTPException
+from sqlalchemy import insert, select
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app.config import settings
+from app.models.click_event import ClickEvent
+from app.models.smart_link import SmartLink
+from app.utils.ip import ip_hash
+from app.utils.user_agent import get_ua_signature_id
+from app.workers.queue import buffer_click, count_click
+
+
+def get_accessible_link(db: Session, short_code: str) -> SmartLink:
+    """
+    Get the smart link behind a short code.
+    
+    Ends the lookup's read-only transaction, so the request's connection
+    goes back to the pool while the click is recorded.
+    
+    Raises:
+        HTTPException 404: If the code is unknown, inactive or expired
+    """
+    link = db.scalar(select(SmartLink).where(SmartLink.short_code == short_code))
+    db.commit()
+    if not link or not link.is_accessible:
+        raise HTTPException(status_code=404, detail="Link not found")
+    return link
+
+
+def _record_click_now(
+    db: Session,
+    link_id: int,
+    ip_address: Optional[str],
+    ua_signature_id: Optional[int],
+    referrer: Optional[str]
+) -> None:
+    """Write one click straight to Postgres (runs in the threadpool)"""
+    db.execute(insert(ClickEvent).values(
+        smart_link_id=link_id,
+        ip_hash=ip_hash(ip_address) if ip_address else None,
+        ua_signature_id=ua_signature_id,
+        referrer=referrer,
+    ))
+    SmartLink.record_click(db, link_id, ip_address)
+    db.commit()
+
+
+async def record_click(
+    db: Session,
+    link_id: int,
+    ip_address: Optional[str],
+    user_agent: Optional[str],
+    referrer: Optional[str]
+) -> None:
+    """
+    Record a click on a smart link (event row plus click counters).
+    
+    Args:
+        db: Request database session (used only for the direct write)
+        link_id: Clicked SmartLink id
+        ip_address: Visitor IP (hashed before storage)
+        user_agent: Raw User-Agent header
+        referrer: Raw Referer header
+    """
+    ua_signature_id = await run_in_threadpool(get_ua_signature_id, user_agent)
+    referrer = referrer[:500] if referrer else None
+    
+    if settings.click_buffer_enabled:
+        await buffer_click({
+            "smart_link_id": link_id,
+            "ip_address": ip_address,
+            "ua_signature_id": ua_signature_id,
+            "referrer": referrer,
+        })
+        await count_click(link_id, ip_address)
+    else:
+        await run_in_threadpool(_record_click_now, db, link_id, ip_address, ua_signature_id, referrer)
@@ -11,7 +11,7 @@ Schemas:
 - CampaignStats: Campaign statistics
 """
 
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import Optional, List, Dict, Any
 from pydantic import BaseModel, Field, field_validator
 from enum import Enum
@@ -19,6 +19,22 @@ from enum import Enum
 from app.models.campaign import CampaignStatus
 
 
+def _future_utc(v: Optional[datetime]) -> Optional[datetime]:
+    """
+    Check a scheduled time is in the future and return it as naive UTC.
+    
+    Campaign timestamps are stored naive UTC; aware input (e.g. "...Z" or
+    "+05:30") is converted instead of failing the naive/aware comparison.
+    """
+    if v is None:
+        return v
+    if v.tzinfo is not None:
+        v = v.astimezone(timezone.utc).replace(tzinfo=None)
+    if v < datetime.now(timezone.utc).replace(tzinfo=None):
+        raise ValueError("Scheduled time must be in the future")
+    return v
+
+
 # ============================================================================
 # CREATE SCHEMAS
 # ============================================================================
@@ -75,27 +91,27 @@ class CampaignCreate(BaseModel):
     @classmethod
     def validate_name(cls, v: str) -> str:
         """Validate campaign name"""
-        if not v or not v.strip():
+        v = v.strip() if v else v
+        if not v:
             raise ValueError("Campaign name cannot be empty")
-        return v.strip()
+        return v
     
     @field_validator('message_template')
     @classmethod
     def validate_message_template(cls, v: str) -> str:
         """Validate message template"""
-        if not v or not v.strip():
+        v = v.strip() if v else v
+        if not v:
             raise ValueError("Message template cannot be empty")
-        if len(v.strip()) < 10:
+        if len(v) < 10:
             raise ValueError("Message template must be at least 10 characters")
-        return v.strip()
+        return v
     
     @field_validator('scheduled_at')
     @classmethod
     def validate_scheduled_at(cls, v: Optional[datetime]) -> Optional[datetime]:
         """Validate scheduled time is in the future"""
-        if v and v < datetime.utcnow():
-            raise ValueError("Scheduled time must be in the future")
-        return v
+        return _future_utc(v)
     
     model_config = {
         "json_schema_extra": {
@@ -160,9 +176,7 @@ class CampaignUpdate(BaseModel):
     @classmethod
     def validate_scheduled_at(cls, v: Optional[datetime]) -> Optional[datetime]:
         """Validate scheduled time is in the future"""
-        if v and v < datetime.utcnow():
-            raise ValueError("Scheduled time must be in the future")
-        return v
+        return _future_utc(v)
 
 
 # ============================================================================
@@ -177,6 +191,8 @@ class CampaignStats(BaseModel):
     failed_count: int = Field(0, description="Number of messages failed")
     success_rate: float = Field(0.0, description="Success rate percentage")
     progress_percentage: float = Field(0.0, description="Sending progress percentage")
+    
+    model_config = {"from_attributes": True}
 
 
 class CampaignResponse(BaseModel):
@@ -341,34 +357,13 @@ def campaign_to_response(campaign) -> CampaignResponse:
     """
     Convert Campaign ORM model to CampaignResponse schema.
     
+    Validated straight from the ORM attributes in pydantic-core
+    (stats via Campaign.stats).
+    
     Args:
         campaign: Campaign ORM model instance
     
     Returns:
         CampaignResponse schema
     """
-    return CampaignResponse(
-        id=campaign.id,
-        name=campaign.name,
-        description=campaign.description,
-        company_id=campaign.company_id,
-        created_by=campaign.created_by,
-        status=campaign.status,
-        message_template=campaign.message_template,
-        template_variables=campaign.template_variables,
-        scheduled_at=campaign.scheduled_at,
-        started_at=campaign.started_at,
-        completed_at=campaign.completed_at,
-        stats=CampaignStats(
-            total_recipients=campaign.total_recipients,
-            sent_count=campaign.sent_count,
-            delivered_count=campaign.delivered_count,
-            failed_count=campaign.failed_count,
-            success_rate=campaign.success_rate,
-            progress_percentage=campaign.progress_percentage
-        ),
-        is_editable=campaign.is_editable,
-        is_sendable=campaign.is_sendable,
-        created_at=campaign.created_at,
-        updated_at=campaign.updated_at
-    )
+    return CampaignResponse.model_validate(campaign)
@@ -10,10 +10,14 @@ Recipients can be added to campaigns via:
 """
 
 from datetime import datetime
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Union
 from pydantic import BaseModel, Field, field_validator, EmailStr
 import re
 
+from app.models.recipient import E164_RE, PHONE_SEPARATORS
+
+_EMAIL_RE = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+
 
 # ============================================================================
 # CREATE SCHEMAS
@@ -38,6 +42,7 @@ class RecipientCreate(BaseModel):
         ...,
         min_length=10,
         max_length=20,
+        json_schema_extra={"pattern": E164_RE.pattern},
         description="Phone number with country code",
         examples=["+1234567890", "+919876543210"]
     )
@@ -52,45 +57,51 @@ class RecipientCreate(BaseModel):
     email: Optional[str] = Field(
         None,
         max_length=255,
+        json_schema_extra={"pattern": _EMAIL_RE.pattern},
         description="Recipient email address",
         examples=["john@example.com"]
     )
     
-    custom_data: Optional[Dict[str, Any]] = Field(
+    # Template variables are flat scalars; nested objects/lists are rejected
+    custom_data: Optional[Dict[str, Union[str, int, float, bool]]] = Field(
         None,
         description="Custom data for template variables (e.g., {name}, {company}, {link})",
         examples=[{"company": "Acme Corp", "link": "https://example.com"}]
     )
     
+    # Normalization runs before the length checks; the format checks run
+    # after them, with messages meant for API and CSV callers
+    
+    @field_validator('phone_number', mode='before')
+    @classmethod
+    def clean_phone_number(cls, v: Any) -> Any:
+        """Remove spaces, dashes, parentheses"""
+        return v.translate(PHONE_SEPARATORS) if isinstance(v, str) else v
+    
     @field_validator('phone_number')
     @classmethod
     def validate_phone_number(cls, v: str) -> str:
         """Validate phone number format"""
-        # Remove spaces, dashes, parentheses
-        cleaned = re.sub(r'[\s\-\(\)]', '', v)
-        
-        # Must start with + and contain only digits after that
-        if not re.match(r'^\+\d{10,15}$', cleaned):
+        if not E164_RE.match(v):
             raise ValueError(
                 "Phone number must start with + and country code, "
                 "followed by 10-15 digits (e.g., +1234567890)"
             )
-        
-        return cleaned
+        return v
+    
+    @field_validator('email', mode='before')
+    @classmethod
+    def normalize_email(cls, v: Any) -> Any:
+        """Normalize to lowercase"""
+        return v.lower() if isinstance(v, str) else v
     
     @field_validator('email')
     @classmethod
     def validate_email(cls, v: Optional[str]) -> Optional[str]:
         """Validate email format"""
-        if v is None:
-            return v
-        
-        # Basic email validation
-        email_pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-        if not re.match(email_pattern, v):
+        if v is not None and not _EMAIL_RE.match(v):
             raise ValueError("Invalid email format")
-        
-        return v.lower()  # Normalize to lowercase
+        return v
     
     model_config = {
         "json_schema_extra": {
@@ -137,17 +148,32 @@ class RecipientBulkCreate(BaseModel):
         description="List of recipients (max 10,000 per request)"
     )
     
-    @field_validator('recipients')
+    @field_validator('recipients', mode='before')
     @classmethod
-    def validate_recipients(cls, v: List[RecipientCreate]) -> List[RecipientCreate]:
-        """Validate recipient list"""
-        if len(v) > 10000:
-            raise ValueError("Maximum 10,000 recipients per request")
+    def validate_recipients(cls, v: Any) -> Any:
+        """
+        Reject duplicate phone numbers (size is enforced by max_length).
         
-        # Check for duplicate phone numbers
-        phone_numbers = [r.phone_number for r in v]
-        if len(phone_numbers) != len(set(phone_numbers)):
-            raise ValueError("Duplicate phone numbers found in the list")
+        Runs on the raw items, before any RecipientCreate is built, so a
+        payload with a repeat fails at the first duplicate instead of after
+        validating every item. Numbers are compared normalized, the same
+        way RecipientCreate cleans them; malformed items are left to
+        RecipientCreate to report.
+        """
+        if not isinstance(v, list):
+            return v
+        
+        seen = set()
+        for item in v:
+            if isinstance(item, RecipientCreate):
+                phone_number = item.phone_number
+            elif isinstance(item, dict) and isinstance(item.get('phone_number'), str):
+                phone_number = item['phone_number'].translate(PHONE_SEPARATORS)
+            else:
+                continue
+            if phone_number in seen:
+                raise ValueError(f"Duplicate phone number in the list: {phone_number}")
+            seen.add(phone_number)
         
         return v
 
@@ -208,9 +234,8 @@ class RecipientListResponse(BaseModel):
     """Response for recipient list endpoint"""
     recipients: List[RecipientResponse] = Field(..., description="List of recipients")
     total: int = Field(..., description="Total number of recipients")
-    page: int = Field(..., description="Current page")
     page_size: int = Field(..., description="Items per page")
-    total_pages: int = Field(..., description="Total pages")
+    next_cursor: Optional[int] = Field(None, description="Cursor for the next page (None on the last page)")
 
 
 class RecipientUploadResponse(BaseModel):
@@ -233,39 +258,3 @@ class RecipientUploadResponse(BaseModel):
         }
     }
 
-
-# ============================================================================
-# CSV PARSING HELPER
-# ============================================================================
-
-class CSVRecipientRow(BaseModel):
-    """
-    Schema for a single row from CSV file.
-    
-    Required columns:
-    - phone_number
-    
-    Optional columns:
-    - name
-    - Any other columns become custom_data
-    """
-    phone_number: str
-    name: Optional[str] = None
-    
-    # Additional fields will be captured in custom_data
-    class Config:
-        extra = "allow"  # Allow extra fields
-    
-    def to_recipient_create(self) -> RecipientCreate:
-        """Convert CSV row to RecipientCreate"""
-        # Get all extra fields as custom_data
-        custom_data = {}
-        for key, value in self.__dict__.items():
-            if key not in ['phone_number', 'name'] and value is not None:
-                custom_data[key] = value
-        
-        return RecipientCreate(
-            phone_number=self.phone_number,
-            name=self.name,
-            custom_data=custom_data if custom_data else None
-        )
@@ -0,0 +1,24 @@
+"""
+IP Address Utilities
+
+Design Decisions:
+- Visitor IPs are reduced to a signed 64-bit BLAKE2b hash (fits BIGINT),
+  so uniqueness checks compare integers instead of 45-char strings
+- The hash is keyed with a key derived from settings.secret_key: the IPv4
+  space is small enough to brute-force an unkeyed hash in minutes, so
+  without the key the stored values would just be IPs in disguise
+- Rotating secret_key changes every hash, so unique-IP counts restart
+  (old and new hashes of the same IP no longer match)
+"""
+
+import hashlib
+
+from app.config import settings
+
+_IP_HASH_KEY = hashlib.blake2b(settings.secret_key_bytes, digest_size=32, person=b"ip-hash").digest()
+
+
+def ip_hash(ip_address: str) -> int:
+    """Signed 64-bit keyed hash of an IP address (fits a BIGINT column)"""
+    digest = hashlib.blake2b(ip_address.encode("ascii"), digest_size=8, key=_IP_HASH_KEY).digest()
+    return int.from_bytes(digest, "big", signed=True)
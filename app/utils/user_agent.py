@@ -0,0 +1,135 @@
+"""
+User Agent Utilities
+
+Parses user agent strings and interns them as UserAgentSignature rows.
+
+Design Decisions:
+- A UA string is parsed once, the first time it is seen; click ingestion
+  only stores the resulting ua_signature_id
+- Signatures are looked up by a 64-bit BLAKE2b hash of the raw string
+- An in-process LRU (1024 entries) answers repeat UAs without touching
+  the database; the table itself is the shared fallback
+"""
+
+import hashlib
+import threading
+from typing import Optional, Tuple
+
+from cachetools import LRUCache
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+
+from app.database import DatabaseSession
+from app.models.user_agent_signature import UserAgentSignature
+
+# {ua_hash: signature id}
+_signature_ids: LRUCache = LRUCache(maxsize=1024)
+_signature_ids_lock = threading.Lock()
+
+
+def ua_hash(user_agent: str) -> int:
+    """Signed 64-bit hash of a user agent string (fits a BIGINT column)"""
+    digest = hashlib.blake2b(user_agent.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big", signed=True)
+
+
+def parse_user_agent(user_agent: str) -> Tuple[str, str, str]:
+    """
+    Classify a user agent string.
+    
+    Returns:
+        Tuple of (device_type, browser, os)
+    
+    Example:
+        parse_user_agent("Mozilla/5.0 (iPhone; ...) ... Safari/604.1")
+        # Returns: ("mobile", "Safari", "iOS")
+    """
+    ua = user_agent.lower()
+    
+    if "ipad" in ua or "tablet" in ua:
+        device_type = "tablet"
+    elif "mobi" in ua or "iphone" in ua or "android" in ua:
+        device_type = "mobile"
+    else:
+        device_type = "desktop"
+    
+    # Order matters: Edge and Opera also advertise Chrome, Chrome advertises Safari
+    if "edg/" in ua:
+        browser = "Edge"
+    elif "opr/" in ua or "opera" in ua:
+        browser = "Opera"
+    elif "firefox/" in ua:
+        browser = "Firefox"
+    elif "chrome/" in ua or "crios/" in ua:
+        browser = "Chrome"
+    elif "safari/" in ua:
+        browser = "Safari"
+    else:
+        browser = "Other"
+    
+    if "iphone" in ua or "ipad" in ua:
+        os = "iOS"
+    elif "android" in ua:
+        os = "Android"
+    elif "windows" in ua:
+        os = "Windows"
+    elif "mac os x" in ua:
+        os = "macOS"
+    elif "linux" in ua:
+        os = "Linux"
+    else:
+        os = "Other"
+    
+    return device_type, browser, os
+
+
+def get_ua_signature_id(user_agent: Optional[str]) -> Optional[int]:
+    """
+    Get (or create) the UserAgentSignature id for a user agent string.
+    
+    Lookup order: in-process LRU, then the user_agent_signatures table.
+    New signatures are inserted with ON CONFLICT DO NOTHING and committed
+    in their own short session, so concurrent workers seeing the same new
+    UA don't fail on the unique index, and a cached id never points at a
+    row that a caller's rollback could undo.
+    
+    Args:
+        user_agent: Raw User-Agent header (None/empty -> None)
+    
+    Returns:
+        Signature id, or None if no user agent was sent
+    """
+    if not user_agent:
+        return None
+    
+    key = ua_hash(user_agent)
+    with _signature_ids_lock:
+        signature_id = _signature_ids.get(key)
+    if signature_id is not None:
+        return signature_id
+    
+    lookup = select(UserAgentSignature.id).where(UserAgentSignature.ua_hash == key)
+    with DatabaseSession() as db:
+        signature_id = db.scalar(lookup)
+        if signature_id is None:
+            device_type, browser, os = parse_user_agent(user_agent)
+            signature_id = db.scalar(
+                insert(UserAgentSignature)
+                .values(
+                    ua_hash=key,
+                    user_agent=user_agent[:500],
+                    device_type=device_type,
+                    browser=browser,
+                    os=os,
+                )
+                .on_conflict_do_nothing(index_elements=[UserAgentSignature.ua_hash])
+                .returning(UserAgentSignature.id)
+            )
+            db.commit()
+            if signature_id is None:
+                # Another worker inserted it first
+                signature_id = db.scalar(lookup)
+    
+    with _signature_ids_lock:
+        _signature_ids[key] = signature_id
+    return signature_id
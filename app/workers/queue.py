@@ -0,0 +1,320 @@
+"""
+Redis Queues
+
+Redis-backed buffers that move write-heavy work off the request path.
+
+Design Decisions:
+- Click events are appended to a Redis list (RPUSH) by the redirect
+  handler, which returns immediately instead of waiting on Postgres
+- A background flusher drains the list in batches and writes them with
+  ClickEvent.bulk_record (one INSERT per batch). Clicks whose link is gone
+  or whose row is rejected are parked in a dead-letter list instead of
+  blocking the batch, and a batch that keeps failing is parked after
+  MAX_CLICK_FLUSH_ATTEMPTS tries.
+- SmartLink click counters live in Redis between flushes: INCR for the
+  total and a HyperLogLog (PFADD ip) for unique visitors, so a popular
+  link isn't a row-lock hotspot. A periodic flush writes one UPDATE per
+  link that was clicked since the last flush.
+- Campaign sends are handed to the sender worker through a Redis list
+  (LPUSH here, BRPOP in app.workers.sender_worker), so the send endpoint
+  returns as soon as the campaign is queued
+- Trade-off: a small durability window (buffered clicks not yet flushed
+  are lost if Redis loses them). Clicks are append-only analytics with no
+  read-after-write requirement, so this is acceptable.
+"""
+
+import asyncio
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+import orjson
+import redis.asyncio as redis
+from redis import Redis
+from sqlalchemy import bindparam, func, select, update
+from sqlalchemy.exc import IntegrityError
+from starlette.concurrency import run_in_threadpool
+
+from app.config import settings
+from app.core.logging import get_logger
+from app.database import DatabaseSession
+from app.models.click_event import ClickEvent
+from app.models.smart_link import SmartLink
+from app.utils.ip import ip_hash
+
+logger = get_logger(__name__)
+
+CLICK_BUFFER_KEY = "clicks:buffer"
+# Clicks that could not be written (deleted link, rejected row, or too many
+# failed flushes); kept for inspection/replay instead of being retried forever
+CLICK_DEAD_LETTER_KEY = "clicks:dead"
+MAX_CLICK_FLUSH_ATTEMPTS = 10
+# Set of smart link ids clicked since the last counter flush
+DIRTY_LINKS_KEY = "smartlink:dirty"
+# Campaign ids waiting for the sender worker
+CAMPAIGN_SEND_QUEUE_KEY = "campaigns:send_queue"
+
+_redis = redis.from_url(settings.redis_url)
+# For sync callers (services running in the threadpool)
+_redis_sync = Redis.from_url(settings.redis_url, socket_connect_timeout=0.5, socket_timeout=0.5)
+
+
+async def buffer_click(event: Dict[str, Any]) -> None:
+    """
+    Queue a click event for asynchronous insertion.
+    
+    Args:
+        event: ClickEvent column dict (smart_link_id, ua_signature_id, ...);
+            a raw "ip_address" key is replaced by its ip_hash
+    
+    Usage (click redirect handler):
+        await buffer_click({"smart_link_id": link.id, "ip_address": ip})
+        return RedirectResponse(link.original_url)
+    """
+    # Stamp the click time now, not when the batch is flushed
+    event.setdefault("clicked_at", datetime.utcnow())
+    ip_address = event.pop("ip_address", None)
+    if ip_address:
+        event["ip_hash"] = ip_hash(ip_address)
+    await _redis.rpush(CLICK_BUFFER_KEY, orjson.dumps(event))
+
+
+def _insert_clicks(events: list) -> list:
+    """
+    Write one batch of buffered clicks (runs in the threadpool).
+    
+    Returns:
+        Events that can never be inserted (to be dead-lettered)
+    """
+    with DatabaseSession() as db:
+        # Links deleted since the click was buffered would fail the FK
+        link_ids = {event["smart_link_id"] for event in events}
+        existing = set(db.scalars(select(SmartLink.id).where(SmartLink.id.in_(link_ids))))
+        rejected = [event for event in events if event["smart_link_id"] not in existing]
+        events = [event for event in events if event["smart_link_id"] in existing]
+        
+        try:
+            ClickEvent.bulk_record(db, events)
+            db.commit()
+        except IntegrityError:
+            # Some row still violates a constraint (e.g. a link deleted
+            # mid-flush): write row by row and set the offenders aside
+            db.rollback()
+            for event in events:
+                try:
+                    with db.begin_nested():
+                        ClickEvent.bulk_record(db, [event])
+                except IntegrityError:
+                    rejected.append(event)
+            db.commit()
+    
+    return rejected
+
+
+async def flush_click_buffer(batch_size: int = 1000) -> int:
+    """
+    Move up to batch_size buffered clicks from Redis into Postgres.
+    
+    Returns:
+        Number of clicks taken off the buffer
+    """
+    # LRANGE + LTRIM in one MULTI so concurrent flushers never double-read
+    async with _redis.pipeline(transaction=True) as pipe:
+        pipe.lrange(CLICK_BUFFER_KEY, 0, batch_size - 1)
+        pipe.ltrim(CLICK_BUFFER_KEY, batch_size, -1)
+        raw_events, _ = await pipe.execute()
+    
+    if not raw_events:
+        return 0
+    
+    events = []
+    attempts = []
+    for raw in raw_events:
+        event = orjson.loads(raw)
+        attempts.append(event.pop("flush_attempts", 0) + 1)
+        event["clicked_at"] = datetime.fromisoformat(event["clicked_at"])
+        events.append(event)
+    
+    try:
+        rejected = await run_in_threadpool(_insert_clicks, events)
+    except Exception:
+        # Put the batch back so the next flush retries it, unless a click
+        # has already failed too many times
+        retry = []
+        dead = []
+        for event, attempt in zip(events, attempts):
+            if attempt < MAX_CLICK_FLUSH_ATTEMPTS:
+                retry.append(orjson.dumps({**event, "flush_attempts": attempt}))
+            else:
+                dead.append(orjson.dumps(event))
+        async with _redis.pipeline(transaction=False) as pipe:
+            if retry:
+                pipe.rpush(CLICK_BUFFER_KEY, *retry)
+            if dead:
+                pipe.rpush(CLICK_DEAD_LETTER_KEY, *dead)
+            await pipe.execute()
+        if dead:
+            logger.error("Moved %d click(s) to %s after %d failed flushes",
+                         len(dead), CLICK_DEAD_LETTER_KEY, MAX_CLICK_FLUSH_ATTEMPTS)
+        raise
+    
+    if rejected:
+        await _redis.rpush(CLICK_DEAD_LETTER_KEY, *(orjson.dumps(event) for event in rejected))
+        logger.warning("Moved %d unwritable click(s) to %s", len(rejected), CLICK_DEAD_LETTER_KEY)
+    
+    return len(events)
+
+
+async def run_click_flusher(interval_seconds: float = 0.5, batch_size: int = 1000):
+    """
+    Background task that drains the click buffer.
+    
+    Keeps flushing without sleeping while full batches come back, so a
+    backlog clears quickly. Backs off (up to a minute) while flushes keep
+    failing, e.g. when Postgres is down.
+    
+    Usage (application lifespan):
+        task = asyncio.create_task(run_click_flusher())
+        ...
+        task.cancel()
+    """
+    failures = 0
+    while True:
+        try:
+            written = await flush_click_buffer(batch_size)
+            failures = 0
+        except Exception as e:
+            logger.error("Click buffer flush failed: %s", e)
+            written = 0
+            failures += 1
+        
+        if failures:
+            await asyncio.sleep(min(interval_seconds * 2 ** failures, 60))
+        elif written < batch_size:
+            await asyncio.sleep(interval_seconds)
+
+
+
+def _clicks_key(link_id) -> str:
+    return f"smartlink:{link_id}:clicks"
+
+
+def _uniques_key(link_id) -> str:
+    return f"smartlink:{link_id}:hll"
+
+
+async def count_click(smart_link_id: int, ip_address: Optional[str]) -> None:
+    """
+    Count a click in Redis (one pipelined round-trip, no DB row lock).
+    
+    Usage (click redirect handler, alongside buffer_click):
+        await count_click(link.id, request.client.host)
+    """
+    async with _redis.pipeline(transaction=False) as pipe:
+        pipe.incr(_clicks_key(smart_link_id))
+        if ip_address:
+            pipe.pfadd(_uniques_key(smart_link_id), ip_address)
+        pipe.sadd(DIRTY_LINKS_KEY, smart_link_id)
+        await pipe.execute()
+
+
+# click_count grows by the flushed delta; unique_click_count takes the HLL
+# estimate (never moving backwards if Redis was reset)
+_update_link_counts = (
+    update(SmartLink.__table__)
+    .where(SmartLink.__table__.c.id == bindparam("link_id"))
+    .values(
+        click_count=SmartLink.__table__.c.click_count + bindparam("clicks"),
+        unique_click_count=func.greatest(
+            SmartLink.__table__.c.unique_click_count, bindparam("uniques")
+        ),
+    )
+)
+
+
+def _write_link_counts(rows: list) -> None:
+    """Apply flushed counters to smart_links (runs in the threadpool)"""
+    with DatabaseSession() as db:
+        db.execute(_update_link_counts, rows)
+        db.commit()
+
+
+async def flush_click_counts() -> int:
+    """
+    Write Redis click counters for every dirty link to Postgres.
+    
+    Returns:
+        Number of smart links updated
+    """
+    async with _redis.pipeline(transaction=True) as pipe:
+        pipe.smembers(DIRTY_LINKS_KEY)
+        pipe.delete(DIRTY_LINKS_KEY)
+        link_ids, _ = await pipe.execute()
+    
+    if not link_ids:
+        return 0
+    
+    link_ids = [int(link_id) for link_id in link_ids]
+    # GET + DEL in one MULTI rather than GETDEL (Redis 6.2+), so no INCR
+    # lands between reading a counter and clearing it
+    async with _redis.pipeline(transaction=True) as pipe:
+        for link_id in link_ids:
+            pipe.get(_clicks_key(link_id))
+            pipe.delete(_clicks_key(link_id))
+            pipe.pfcount(_uniques_key(link_id))
+        results = await pipe.execute()
+    
+    rows = [
+        {
+            "link_id": link_id,
+            "clicks": int(results[3 * i] or 0),
+            "uniques": results[3 * i + 2],
+        }
+        for i, link_id in enumerate(link_ids)
+    ]
+    
+    try:
+        await run_in_threadpool(_write_link_counts, rows)
+    except Exception:
+        # Give the deltas back so the next flush retries them
+        async with _redis.pipeline(transaction=False) as pipe:
+            for row in rows:
+                pipe.incrby(_clicks_key(row["link_id"]), row["clicks"])
+                pipe.sadd(DIRTY_LINKS_KEY, row["link_id"])
+            await pipe.execute()
+        raise
+    
+    return len(rows)
+
+
+async def run_click_count_flusher(interval_seconds: float = 10):
+    """
+    Background task that periodically calls flush_click_counts().
+    
+    Usage (application lifespan):
+        task = asyncio.create_task(run_click_count_flusher())
+        ...
+        task.cancel()
+    """
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            await flush_click_counts()
+        except Exception as e:
+            logger.error("Click counter flush failed: %s", e)
+
+
+def enqueue_campaign_send(campaign_id: int) -> None:
+    """
+    Queue a campaign for the sender worker (sync; raises redis.RedisError).
+    
+    Usage (send_campaign service, status change flushed but not committed):
+        enqueue_campaign_send(campaign.id)
+        db.commit()
+    """
+    _redis_sync.lpush(CAMPAIGN_SEND_QUEUE_KEY, campaign_id)
+
+
+async def dequeue_campaign_send() -> int:
+    """Block until a campaign id is queued and return it (FIFO with LPUSH)"""
+    _, campaign_id = await _redis.brpop(CAMPAIGN_SEND_QUEUE_KEY, timeout=0)
+    return int(campaign_id)
@@ -0,0 +1,258 @@
+"""
+Sender Worker
+
+Background work around message delivery.
+
+Design Decisions:
+- Campaign status counts are read from the mv_campaign_status_counts
+  materialized view; this worker refreshes it on an interval so dashboard
+  reads never scan message_logs. Only this (single) process refreshes it:
+  one REFRESH per API worker would just queue up on the view's lock
+- Campaign sends are pulled off the campaigns:send_queue Redis list
+  (BRPOP) instead of running inside the send request; run this module as
+  its own process: python -m app.workers.sender_worker
+- Recipients are sent in keyset batches of SEND_BATCH_SIZE; each batch
+  writes its message_logs rows and bumps the campaign counters in one
+  transaction, and re-checks the campaign status first, so a cancel takes
+  effect within one batch
+- Delivery goes through app.modules.mock_sender until the WhatsApp client
+  exists; a send (or template render) that raises is stored as a FAILED
+  message_logs row, and a crash mid-campaign marks the campaign FAILED
+"""
+
+import asyncio
+from datetime import datetime, timezone
+from typing import Optional
+
+from redis import RedisError
+from sqlalchemy import Row, insert, select, update
+from starlette.concurrency import run_in_threadpool
+
+from app.config import settings
+from app.core.logging import get_logger, setup_logging
+from app.database import engine, DatabaseSession, utc_now
+from app.models.campaign import Campaign, CampaignStatus
+from app.models.message_log import MessageLog, MessageStatus, refresh_campaign_status_counts
+from app.models.recipient import Recipient
+from app.modules.campaigns.cache import invalidate_campaign_lists
+from app.modules.mock_sender.sender import send_message
+from app.workers.queue import dequeue_campaign_send
+
+logger = get_logger(__name__)
+
+# Recipients sent (and message_logs rows written) per transaction
+SEND_BATCH_SIZE = 500
+
+
+def _refresh_status_counts() -> None:
+    """Refresh the status counts view (runs in the threadpool)"""
+    with engine.begin() as conn:
+        refresh_campaign_status_counts(conn)
+
+
+async def run_status_counts_refresher(interval_seconds: float = 30):
+    """
+    Background task that keeps mv_campaign_status_counts fresh.
+    
+    Started by main() alongside the campaign sender.
+    """
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            await run_in_threadpool(_refresh_status_counts)
+        except Exception as e:
+            logger.error("Campaign status counts refresh failed: %s", e)
+
+
+class _TemplateValues(dict):
+    """Template values that leave unknown placeholders as written"""
+    
+    def __missing__(self, key):
+        return "{" + key + "}"
+
+
+def render_message(template: str, recipient) -> str:
+    """
+    Fill a campaign message template for one recipient.
+    
+    Placeholders ({name}, {company}, ...) come from the recipient's
+    custom_data plus its name, phone_number and email columns.
+    
+    Args:
+        template: Campaign message_template
+        recipient: Recipient, or a row with the same column attributes
+    
+    Raises:
+        ValueError: If the template is malformed (e.g. an unmatched brace)
+    """
+    values = _TemplateValues(recipient.custom_data or {})
+    values["name"] = recipient.name or ""
+    values["phone_number"] = recipient.phone_number
+    values["email"] = recipient.email or ""
+    return template.format_map(values)
+
+
+# Columns only: the worker session lives for the whole campaign, so ORM
+# objects would pile up in its identity map (and go stale across commits)
+_select_recipients = select(
+    Recipient.id, Recipient.phone_number, Recipient.name, Recipient.email, Recipient.custom_data
+)
+
+
+def _lock_sending_campaign(db, campaign_id: int) -> Optional[Row]:
+    """
+    Lock the campaign row if it is still SENDING, else return None.
+    
+    FOR UPDATE waits out a send request that has queued the campaign but
+    not committed yet, and makes a concurrent cancel wait for the batch.
+    """
+    campaign = db.execute(
+        select(Campaign.status, Campaign.company_id, Campaign.message_template)
+        .where(Campaign.id == campaign_id)
+        .with_for_update()
+    ).first()
+    if campaign is None or campaign.status != CampaignStatus.SENDING:
+        return None
+    return campaign
+
+
+def _send_batch(campaign_id: int, template: str, recipients: list) -> list:
+    """Send one batch of messages; returns the message_logs rows"""
+    rows = []
+    for recipient in recipients:
+        row = {
+            "campaign_id": campaign_id,
+            "recipient_id": recipient.id,
+            "phone_number": recipient.phone_number,
+            "message_content": template,
+            "status": MessageStatus.SENT,
+            "whatsapp_message_id": None,
+            "error_message": None,
+            "sent_at": None,
+        }
+        try:
+            row["message_content"] = render_message(template, recipient)
+            row["whatsapp_message_id"] = send_message(recipient.phone_number, row["message_content"])
+            row["sent_at"] = datetime.now(timezone.utc).replace(tzinfo=None)
+        except Exception as e:
+            row["status"] = MessageStatus.FAILED
+            row["error_message"] = str(e)
+        rows.append(row)
+    return rows
+
+
+def _send_campaign(campaign_id: int) -> bool:
+    """
+    Send a queued campaign to all of its recipients (runs in the threadpool).
+    
+    Returns:
+        False if the campaign was no longer SENDING when picked up
+    """
+    last_id = 0
+    company_id = None
+    with DatabaseSession() as db:
+        while True:
+            campaign = _lock_sending_campaign(db, campaign_id)
+            if campaign is None:
+                db.rollback()
+                if company_id is None:
+                    return False
+                # Cancelled mid-send; the cancel already reset the list cache
+                logger.info("Campaign %s stopped after recipient %s", campaign_id, last_id)
+                return True
+            company_id = campaign.company_id
+            
+            recipients = db.execute(
+                _select_recipients
+                .where(Recipient.campaign_id == campaign_id, Recipient.id > last_id)
+                .order_by(Recipient.id)
+                .limit(SEND_BATCH_SIZE)
+            ).all()
+            if not recipients:
+                break
+            last_id = recipients[-1].id
+            
+            rows = _send_batch(campaign_id, campaign.message_template, recipients)
+            sent = sum(1 for row in rows if row["status"] == MessageStatus.SENT)
+            db.execute(insert(MessageLog), rows)
+            db.execute(
+                update(Campaign)
+                .where(Campaign.id == campaign_id)
+                .values(
+                    sent_count=Campaign.sent_count + sent,
+                    failed_count=Campaign.failed_count + (len(rows) - sent),
+                )
+            )
+            db.commit()
+        
+        db.execute(
+            update(Campaign)
+            .where(Campaign.id == campaign_id)
+            .values(status=CampaignStatus.COMPLETED, completed_at=utc_now)
+        )
+        db.commit()
+    
+    invalidate_campaign_lists(company_id)
+    logger.info("Campaign %s completed", campaign_id)
+    return True
+
+
+def _fail_campaign(campaign_id: int) -> None:
+    """Mark a campaign whose send crashed as FAILED (runs in the threadpool)"""
+    with DatabaseSession() as db:
+        company_id = db.scalar(
+            update(Campaign)
+            .where(Campaign.id == campaign_id, Campaign.status == CampaignStatus.SENDING)
+            .values(status=CampaignStatus.FAILED, completed_at=utc_now)
+            .returning(Campaign.company_id)
+        )
+        db.commit()
+    if company_id is not None:
+        invalidate_campaign_lists(company_id)
+
+
+async def run_campaign_sender():
+    """
+    Worker loop that drains the campaign send queue.
+    
+    Usage:
+        python -m app.workers.sender_worker
+    """
+    while True:
+        try:
+            campaign_id = await dequeue_campaign_send()
+        except RedisError as e:
+            logger.error("Campaign send queue unavailable: %s", e)
+            await asyncio.sleep(1)
+            continue
+        
+        try:
+            if not await run_in_threadpool(_send_campaign, campaign_id):
+                logger.info("Campaign %s is no longer sending, skipped", campaign_id)
+        except Exception as e:
+            logger.error("Campaign %s send failed: %s", campaign_id, e)
+            try:
+                await run_in_threadpool(_fail_campaign, campaign_id)
+            except Exception as e:
+                logger.error("Campaign %s could not be marked failed: %s", campaign_id, e)
+
+
+async def main():
+    """
+    Sender worker process: the campaign send loop plus the status counts
+    refresher (settings.campaign_stats_refresh_seconds, 0 disables it).
+    
+    Usage:
+        python -m app.workers.sender_worker
+    """
+    tasks = [asyncio.create_task(run_campaign_sender())]
+    if settings.campaign_stats_refresh_seconds:
+        tasks.append(asyncio.create_task(
+            run_status_counts_refresher(settings.campaign_stats_refresh_seconds)
+        ))
+    await asyncio.gather(*tasks)
+
+
+if __name__ == "__main__":
+    setup_logging()
+    asyncio.run(main())
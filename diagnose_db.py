@@ -55,7 +55,9 @@ try:
         port=port,
         user=username,
         password=password,
-        database=database
+        database=database,
+        connect_timeout=3,  # Fail fast instead of waiting out the OS TCP timeout
+        application_name="pinglayer-diagnose"
     )
     conn.close()
     print("   ✅ PostgreSQL connection successful!")
@@ -102,12 +104,14 @@ except Exception as e:
 # Test 4: Check SQLAlchemy connection
 print("\n4️⃣ Testing SQLAlchemy connection...")
 try:
-    from app.database import check_db_connection
-    if check_db_connection():
-        print("   ✅ SQLAlchemy connection successful!")
-    else:
-        print("   ❌ SQLAlchemy connection failed")
-        sys.exit(1)
+    # One engine for tests 4 and 5: the connection checked out here goes
+    # back to its pool and is reused by the table inspection below
+    from app.database import engine
+    from sqlalchemy import text
+    
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+    print("   ✅ SQLAlchemy connection successful!")
 except Exception as e:
     print(f"   ❌ SQLAlchemy test failed: {e}")
     sys.exit(1)
@@ -115,7 +119,6 @@ except Exception as e:
 # Test 5: Check if tables exist
 print("\n5️⃣ Checking database tables...")
 try:
-    from app.database import engine
     from sqlalchemy import inspect
     
     inspector = inspect(engine)